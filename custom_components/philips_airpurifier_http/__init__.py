@@ -1 +1,137 @@
 """ philips_airpurifier_http platform setup """
+
+import voluptuous as vol
+import homeassistant.helpers.config_validation as cv
+from homeassistant.const import CONF_HOST, Platform
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    ATTR_SESSION_KEY,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_REQUESTS_PER_SECOND,
+    DATA_PHILIPS_FLEET,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+    CONF_FILTERS_INTERVAL,
+    CONF_FIRMWARE_INTERVAL,
+    CONF_STATUS_INTERVAL,
+    CONF_WRITE_DELAY,
+    DEFAULT_FILTERS_INTERVAL,
+    DEFAULT_FIRMWARE_INTERVAL,
+    DEFAULT_STATUS_INTERVAL,
+    DEFAULT_WRITE_DELAY,
+    DOMAIN,
+)
+from .coordinator import PhilipsAirPurifierCoordinator
+from .fleet import FleetLimiter, get_fleet_limiter
+from .http_client import AsyncHTTPAirClient, async_import_crypto
+from .scheduler import (
+    ENDPOINT_FILTERS,
+    ENDPOINT_FIRMWARE,
+    ENDPOINT_STATUS,
+    PollScheduler,
+)
+from .services import async_register_services
+from .store import async_get_device_store
+
+# Purifiers are configured per device, the domain only holds fleet-wide limits
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Schema(
+            {
+                vol.Optional(
+                    CONF_MAX_CONCURRENT_REQUESTS,
+                    default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_MAX_REQUESTS_PER_SECOND,
+                    default=DEFAULT_MAX_REQUESTS_PER_SECOND,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+# Platforms sharing a purifier's coordinator
+PLATFORMS = [Platform.FAN, Platform.SENSOR, Platform.SWITCH, Platform.NUMBER]
+
+
+async def async_setup(hass, config):
+    """Register the services and limits shared by all purifiers."""
+    if DOMAIN in config:
+        hass.data[DATA_PHILIPS_FLEET] = FleetLimiter(
+            config[DOMAIN][CONF_MAX_CONCURRENT_REQUESTS],
+            config[DOMAIN][CONF_MAX_REQUESTS_PER_SECOND],
+        )
+    async_register_services(hass)
+    return True
+
+
+async def async_setup_entry(hass, entry):
+    """Set up a purifier without waiting for it to answer.
+
+    The client only talks to the device on the first poll, so slow or
+    offline purifiers don't hold up Home Assistant's startup.
+    """
+    host = entry.data[CONF_HOST]
+    store = await async_get_device_store(hass)
+    session_key = store.get(host, ATTR_SESSION_KEY)
+    fleet = get_fleet_limiter(hass)
+    await async_import_crypto(hass)
+    client = AsyncHTTPAirClient(
+        host,
+        async_get_clientsession(hass),
+        bytes.fromhex(session_key) if session_key is not None else None,
+        limiter=fleet,
+    )
+
+    options = entry.options
+    status_interval = options.get(
+        CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL.total_seconds()
+    )
+    scheduler = PollScheduler(
+        {
+            ENDPOINT_STATUS: status_interval,
+            ENDPOINT_FILTERS: options.get(
+                CONF_FILTERS_INTERVAL, DEFAULT_FILTERS_INTERVAL.total_seconds()
+            ),
+            ENDPOINT_FIRMWARE: options.get(
+                CONF_FIRMWARE_INTERVAL, DEFAULT_FIRMWARE_INTERVAL.total_seconds()
+            ),
+        },
+        start_offset=fleet.next_start_offset(
+            status_interval, restored=store.get_snapshot(host) is not None
+        ),
+    )
+
+    coordinator = PhilipsAirPurifierCoordinator(
+        hass,
+        client,
+        store,
+        scheduler,
+        options.get(CONF_WRITE_DELAY, DEFAULT_WRITE_DELAY),
+        entry.unique_id or entry.entry_id,
+    )
+    # Entities depend on what the model supports, load its profile first
+    await coordinator.async_load_model()
+    coordinator.restore_snapshot()
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    return True
+
+
+async def async_unload_entry(hass, entry):
+    """Unload a purifier."""
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+    return unload_ok
+
+
+async def _async_update_listener(hass, entry):
+    """Apply new options by reloading the entry."""
+    await hass.config_entries.async_reload(entry.entry_id)
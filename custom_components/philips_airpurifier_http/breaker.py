@@ -0,0 +1,106 @@
+"""Circuit breaker for unreachable philips_airpurifier_http devices."""
+
+import time
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Consecutive failed requests after which a device is considered unreachable
+FAILURE_THRESHOLD = 3
+# Seconds to wait before probing an unreachable device for the first time
+RESET_TIMEOUT = 30
+# Upper bound for the wait between probes of a device that stays unreachable
+MAX_RESET_TIMEOUT = 30 * 60
+
+
+class CircuitBreaker:
+    """Stop sending requests to a device that keeps failing.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    requests are rejected without touching the network. Once the reset
+    timeout has passed a single probe request is let through: if it
+    succeeds the breaker closes, otherwise it opens again with twice the
+    timeout.
+    """
+
+    def __init__(
+        self,
+        failure_threshold=FAILURE_THRESHOLD,
+        reset_timeout=RESET_TIMEOUT,
+        max_reset_timeout=MAX_RESET_TIMEOUT,
+    ):
+        self._failure_threshold = failure_threshold
+        self._base_reset_timeout = reset_timeout
+        self._max_reset_timeout = max_reset_timeout
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened = False
+        self._retry_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self):
+        """Return the current state of the breaker."""
+        if not self._opened:
+            return STATE_CLOSED
+        if time.monotonic() < self._retry_at:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    def seconds_until_probe(self):
+        """Return how long to wait before the device can be probed again."""
+        return max(0.0, self._retry_at - time.monotonic()) if self._opened else 0.0
+
+    def try_acquire(self):
+        """Return True if a request may be sent now.
+
+        While half-open only one request at a time is allowed through.
+        """
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def release(self):
+        """Give back a request allowed by try_acquire once it is over.
+
+        Requests that neither succeeded nor failed, e.g. cancelled ones,
+        would otherwise keep the breaker from probing again.
+        """
+        self._probing = False
+
+    def record_success(self):
+        """Close the breaker after a request was answered.
+
+        Return True if the breaker was open.
+        """
+        was_open = self._opened
+        self._failures = 0
+        self._opened = False
+        self._probing = False
+        self._reset_timeout = self._base_reset_timeout
+        return was_open
+
+    def record_failure(self):
+        """Count a failed request, opening the breaker if needed.
+
+        Return True if this failure opened the breaker.
+        """
+        self._failures += 1
+        if self._probing:
+            # The probe failed, wait longer before the next one
+            self._probing = False
+            self._reset_timeout = min(self._reset_timeout * 2, self._max_reset_timeout)
+            self._retry_at = time.monotonic() + self._reset_timeout
+            return False
+
+        if self._opened or self._failures < self._failure_threshold:
+            return False
+
+        self._opened = True
+        self._retry_at = time.monotonic() + self._reset_timeout
+        return True
@@ -0,0 +1,238 @@
+"""Config flow for philips_airpurifier_http."""
+
+from urllib.parse import urlparse
+
+import voluptuous as vol
+from homeassistant import config_entries
+from homeassistant.const import CONF_HOST, CONF_NAME
+from homeassistant.core import callback
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    ATTR_MAC_ADDRESS,
+    ATTR_MODEL,
+    ATTR_SESSION_KEY,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_FILTERS_INTERVAL,
+    CONF_FIRMWARE_INTERVAL,
+    CONF_STATUS_INTERVAL,
+    CONF_WRITE_DELAY,
+    DEFAULT_FILTERS_INTERVAL,
+    DEFAULT_FIRMWARE_INTERVAL,
+    DEFAULT_NAME,
+    DEFAULT_STATUS_INTERVAL,
+    DEFAULT_WRITE_DELAY,
+    DOMAIN,
+    PHILIPS_MAC_ADDRESS,
+    PHILIPS_MODEL_NAME,
+)
+from .fleet import get_fleet_limiter
+from .http_client import (
+    AsyncHTTPAirClient,
+    PhilipsAirClientError,
+    async_import_crypto,
+)
+from .store import async_get_device_store
+
+# Name of the device in its UPnP description
+UPNP_FRIENDLY_NAME = "friendlyName"
+
+USER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_HOST): str,
+        vol.Optional(CONF_NAME, default=DEFAULT_NAME): str,
+    }
+)
+
+
+async def async_read_device(hass, host):
+    """Read the firmware information of a device, keeping what it learned.
+
+    The negotiated session key, model and MAC address are stored so setting
+    up the entry afterwards doesn't need to ask the device again.
+    """
+    store = await async_get_device_store(hass)
+    await async_import_crypto(hass)
+    client = AsyncHTTPAirClient(
+        host, async_get_clientsession(hass), limiter=get_fleet_limiter(hass)
+    )
+    client.add_key_listener(
+        lambda session_key: store.set(host, ATTR_SESSION_KEY, session_key.hex())
+    )
+    firmware = await client.async_get_firmware()
+
+    if firmware.get(PHILIPS_MODEL_NAME) is not None:
+        store.set(host, ATTR_MODEL, firmware[PHILIPS_MODEL_NAME])
+    if firmware.get(PHILIPS_MAC_ADDRESS) is not None:
+        store.set(host, ATTR_MAC_ADDRESS, firmware[PHILIPS_MAC_ADDRESS])
+    return firmware
+
+
+class PhilipsAirPurifierConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
+    """Set up a purifier from the UI, SSDP discovery or YAML."""
+
+    VERSION = 1
+
+    def __init__(self):
+        self._host = None
+        self._name = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow."""
+        return PhilipsAirPurifierOptionsFlow(config_entry)
+
+    async def async_step_user(self, user_input=None):
+        """Set up a purifier by its address."""
+        errors = {}
+        if user_input is not None:
+            host = user_input[CONF_HOST]
+            self._async_abort_entries_match({CONF_HOST: host})
+            try:
+                firmware = await async_read_device(self.hass, host)
+            except PhilipsAirClientError:
+                errors["base"] = "cannot_connect"
+            else:
+                await self._async_set_mac_address(firmware, host)
+                return self.async_create_entry(
+                    title=user_input[CONF_NAME],
+                    data={CONF_HOST: host, CONF_NAME: user_input[CONF_NAME]},
+                )
+
+        return self.async_show_form(
+            step_id="user", data_schema=USER_SCHEMA, errors=errors
+        )
+
+    async def async_step_ssdp(self, discovery_info):
+        """Handle a purifier announced over SSDP."""
+        host = urlparse(discovery_info.ssdp_location).hostname
+        self._async_abort_entries_match({CONF_HOST: host})
+        try:
+            firmware = await async_read_device(self.hass, host)
+        except PhilipsAirClientError:
+            return self.async_abort(reason="cannot_connect")
+
+        await self._async_set_mac_address(firmware, host)
+        self._host = host
+        self._name = discovery_info.upnp.get(UPNP_FRIENDLY_NAME, DEFAULT_NAME)
+        self.context["title_placeholders"] = {"name": self._name}
+        return await self.async_step_discovery_confirm()
+
+    async def async_step_discovery_confirm(self, user_input=None):
+        """Confirm setting up a discovered purifier."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title=self._name, data={CONF_HOST: self._host, CONF_NAME: self._name}
+            )
+
+        self._set_confirm_only()
+        return self.async_show_form(
+            step_id="discovery_confirm",
+            description_placeholders={"name": self._name, "host": self._host},
+        )
+
+    async def async_step_import(self, import_data):
+        """Import a purifier configured under the YAML fan platform.
+
+        Purifiers imported before are updated from the YAML instead, without
+        contacting them again.
+        """
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            "deprecated_yaml",
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="deprecated_yaml",
+        )
+
+        host = import_data[CONF_HOST]
+        data = {CONF_HOST: host, CONF_NAME: import_data[CONF_NAME]}
+        options = {
+            CONF_STATUS_INTERVAL: import_data[CONF_STATUS_INTERVAL].total_seconds(),
+            CONF_FILTERS_INTERVAL: import_data[CONF_FILTERS_INTERVAL].total_seconds(),
+            CONF_FIRMWARE_INTERVAL: import_data[CONF_FIRMWARE_INTERVAL].total_seconds(),
+            CONF_WRITE_DELAY: import_data[CONF_WRITE_DELAY],
+            CONF_DIAGNOSTIC_SENSORS: import_data[CONF_DIAGNOSTIC_SENSORS],
+        }
+        for entry in self._async_current_entries(include_ignore=False):
+            if entry.data.get(CONF_HOST) != host:
+                continue
+            # Purifiers set up from the UI are managed there
+            if entry.source == config_entries.SOURCE_IMPORT:
+                self.hass.config_entries.async_update_entry(
+                    entry, title=data[CONF_NAME], data=data, options=options
+                )
+            return self.async_abort(reason="already_configured")
+
+        try:
+            firmware = await async_read_device(self.hass, host)
+        except PhilipsAirClientError:
+            # Import offline devices anyway, they are set up once reachable
+            pass
+        else:
+            await self._async_set_mac_address(firmware, host)
+
+        return self.async_create_entry(
+            title=data[CONF_NAME], data=data, options=options
+        )
+
+    async def _async_set_mac_address(self, firmware, host):
+        """Identify the entry by the device's MAC address when it reports one."""
+        mac_address = firmware.get(PHILIPS_MAC_ADDRESS)
+        if mac_address is None:
+            return
+        await self.async_set_unique_id(mac_address)
+        self._abort_if_unique_id_configured(updates={CONF_HOST: host})
+
+
+class PhilipsAirPurifierOptionsFlow(config_entries.OptionsFlow):
+    """Tune polling and writes of a configured purifier."""
+
+    def __init__(self, config_entry):
+        self._options = dict(config_entry.options)
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_STATUS_INTERVAL,
+                        default=options.get(
+                            CONF_STATUS_INTERVAL,
+                            DEFAULT_STATUS_INTERVAL.total_seconds(),
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_FILTERS_INTERVAL,
+                        default=options.get(
+                            CONF_FILTERS_INTERVAL,
+                            DEFAULT_FILTERS_INTERVAL.total_seconds(),
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_FIRMWARE_INTERVAL,
+                        default=options.get(
+                            CONF_FIRMWARE_INTERVAL,
+                            DEFAULT_FIRMWARE_INTERVAL.total_seconds(),
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_WRITE_DELAY,
+                        default=options.get(CONF_WRITE_DELAY, DEFAULT_WRITE_DELAY),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_DIAGNOSTIC_SENSORS,
+                        default=options.get(CONF_DIAGNOSTIC_SENSORS, False),
+                    ): bool,
+                }
+            ),
+        )
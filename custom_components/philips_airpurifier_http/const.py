@@ -1,14 +1,39 @@
 """ philips_airpurifier_http constants"""
 
+from datetime import timedelta
+
+from .value_map import ValueMap
+
 # Integration setup
 DOMAIN = "philips_airpurifier_http"
 DATA_PHILIPS_FANS = "fan.philips_airpurifier"
+DATA_PHILIPS_STORE = "philips_airpurifier_http.store"
+DATA_PHILIPS_FLEET = "philips_airpurifier_http.fleet"
+MANUFACTURER = "Philips"
 
 # Integration defaults
 DEFAULT_NAME = "Philips AirPurifier"
 DEFAULT_ICON = "mdi:air-purifier"
+DEFAULT_STATUS_INTERVAL = timedelta(seconds=30)
+DEFAULT_FILTERS_INTERVAL = timedelta(minutes=30)
+DEFAULT_FIRMWARE_INTERVAL = timedelta(days=1)
+DEFAULT_WRITE_DELAY = 0.1
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+DEFAULT_MAX_REQUESTS_PER_SECOND = 10
+
+# Configuration
+CONF_STATUS_INTERVAL = "status_interval"
+CONF_FILTERS_INTERVAL = "filters_interval"
+CONF_FIRMWARE_INTERVAL = "firmware_interval"
+CONF_WRITE_DELAY = "write_delay"
+CONF_DIAGNOSTIC_SENSORS = "diagnostic_sensors"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_MAX_REQUESTS_PER_SECOND = "max_requests_per_second"
 
 # Services
+SERVICE_MAX_CONCURRENCY = 10
+SERVICE_DEVICE_TIMEOUT = 15
+
 SERVICE_SET_FUNCTION = "set_function"
 SERVICE_SET_TARGET_HUMIDITY = "set_target_humidity"
 SERVICE_SET_LIGHT_BRIGHTNESS = "set_light_brightness"
@@ -16,6 +41,8 @@ SERVICE_SET_CHILD_LOCK = "set_child_lock"
 SERVICE_SET_TIMER = "set_timer"
 SERVICE_SET_DISPLAY_LIGHT = "set_display_light"
 SERVICE_SET_USED_INDEX = "set_used_index"
+SERVICE_GET_HISTORY = "get_history"
+SERVICE_APPLY_STATE = "apply_state"
 
 # Service attributes
 SERVICE_ATTR_ENTITY_ID = "entity_id"
@@ -26,9 +53,18 @@ SERVICE_ATTR_CHILD_LOCK = "lock"
 SERVICE_ATTR_TIMER_HOURS = "hours"
 SERVICE_ATTR_DISPLAY_LIGHT = "light"
 SERVICE_ATTR_USED_INDEX = "used_index"
+SERVICE_ATTR_ATTRIBUTE = "attribute"
+SERVICE_ATTR_WINDOW = "window"
+SERVICE_ATTR_BUCKET = "bucket"
+SERVICE_ATTR_POWER = "power"
+SERVICE_ATTR_PERCENTAGE = "percentage"
+SERVICE_ATTR_PRESET_MODE = "preset_mode"
 
 # Device attribute keys
 ATTR_MODEL = "model"
+ATTR_MAC_ADDRESS = "mac_address"
+ATTR_SESSION_KEY = "session_key"
+ATTR_STALE = "stale"
 ATTR_FUNCTION = "function"
 ATTR_USED_INDEX = "used_index"
 ATTR_PM25 = "pm25"
@@ -47,6 +83,11 @@ ATTR_WICK_FILTER = "wick_filter"
 ATTR_CARBON_FILTER = "carbon_filter"
 ATTR_HEPA_FILTER = "hepa_filter"
 
+# Device snapshot keys not exposed as attributes
+ATTR_POWER = "power"
+ATTR_FAN_SPEED = "fan_speed"
+ATTR_PRESET_MODE = "preset_mode"
+
 # Philips API keys
 PHILIPS_ALLERGEN_INDEX = "iaql"
 PHILIPS_LIGHT_BRIGHTNESS = "aqil"
@@ -65,10 +106,17 @@ PHILIPS_USED_INDEX = "ddp"
 PHILIPS_WATER_LEVEL = "wl"
 PHILIPS_DISPLAY_LIGHT = "uil"
 
+PHILIPS_PRE_FILTER = "fltsts0"
+PHILIPS_HEPA_FILTER = "fltsts1"
+PHILIPS_CARBON_FILTER = "fltsts2"
+PHILIPS_WICK_FILTER = "wicksts"
+
 PHILIPS_MODEL_NAME = "name"
 PHILIPS_MAC_ADDRESS = "macaddress"
 
 # Philips API values
+PHILIPS_POWER_ON = "1"
+PHILIPS_POWER_OFF = "0"
 PHILIPS_SPEED_SILENT = "s"
 PHILIPS_SPEED_TURBO = "t"
 PHILIPS_MODE_AUTO = "P"
@@ -80,6 +128,14 @@ PHILIPS_MODE_NIGH = "N"
 PHILIPS_FUNCTION_PURIFICATION = "P"
 PHILIPS_FUNCTION_BOTH = "PH"
 
+# Power values
+POWER_MAP = ValueMap(
+    {
+        PHILIPS_POWER_ON: "on",
+        PHILIPS_POWER_OFF: "off",
+    }
+)
+
 # Speed values
 SPEED_SILENT = "Silent"
 SPEED_1 = "Speed 1"
@@ -88,13 +144,15 @@ SPEED_3 = "Speed 3"
 SPEED_TURBO = "Turbo"
 
 ALL_SPEEDS = [SPEED_SILENT, SPEED_1, SPEED_2, SPEED_3, SPEED_TURBO]
-SPEED_MAP = {
-    PHILIPS_SPEED_SILENT: SPEED_SILENT,
-    "1": SPEED_1,
-    "2": SPEED_2,
-    "3": SPEED_3,
-    PHILIPS_SPEED_TURBO: SPEED_TURBO,
-}
+SPEED_MAP = ValueMap(
+    {
+        PHILIPS_SPEED_SILENT: SPEED_SILENT,
+        "1": SPEED_1,
+        "2": SPEED_2,
+        "3": SPEED_3,
+        PHILIPS_SPEED_TURBO: SPEED_TURBO,
+    }
+)
 
 # Mode values
 MODE_AUTO = "auto"
@@ -113,32 +171,38 @@ ALL_MODES = [
     MODE_NIGHT,
 ]
 
-MODE_MAP = {
-    PHILIPS_MODE_AUTO: MODE_AUTO,
-    PHILIPS_MODE_ALLERGEN: MODE_ALLERGEN,
-    PHILIPS_MODE_SLEEP: MODE_SLEEP,
-    PHILIPS_MODE_MANUAL: MODE_MANUAL,
-    PHILIPS_MODE_BACTERIA: MODE_BACTERIA,
-    PHILIPS_MODE_NIGH: MODE_NIGHT,
-}
+MODE_MAP = ValueMap(
+    {
+        PHILIPS_MODE_AUTO: MODE_AUTO,
+        PHILIPS_MODE_ALLERGEN: MODE_ALLERGEN,
+        PHILIPS_MODE_SLEEP: MODE_SLEEP,
+        PHILIPS_MODE_MANUAL: MODE_MANUAL,
+        PHILIPS_MODE_BACTERIA: MODE_BACTERIA,
+        PHILIPS_MODE_NIGH: MODE_NIGHT,
+    }
+)
 
 # Function values
 FUNCTION_PURIFICATION = "Purification"
 FUNCTION_BOTH = "Purification & Humidification"
-FUNCTION_MAP = {
-    PHILIPS_FUNCTION_PURIFICATION: FUNCTION_PURIFICATION,
-    PHILIPS_FUNCTION_BOTH: FUNCTION_BOTH,
-}
+FUNCTION_MAP = ValueMap(
+    {
+        PHILIPS_FUNCTION_PURIFICATION: FUNCTION_PURIFICATION,
+        PHILIPS_FUNCTION_BOTH: FUNCTION_BOTH,
+    }
+)
 
 
 # Misc values
 
-DISPLAY_LIGHT_MAP = {
-    "0": False,
-    "1": True,
-}
+DISPLAY_LIGHT_MAP = ValueMap(
+    {
+        "0": False,
+        "1": True,
+    }
+)
 
-USED_INDEX_MAP = {"1": "PM2.5", "0": "IAI"}
+USED_INDEX_MAP = ValueMap({"1": "PM2.5", "0": "IAI"})
 
 TARGET_HUMIDITY_LIST = [40, 50, 60]
 LIGHT_BRIGHTNESS_LIST = [0, 25, 50, 75, 100]
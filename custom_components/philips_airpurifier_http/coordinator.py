@@ -0,0 +1,302 @@
+"""Shared polling of a single philips_airpurifier_http device."""
+
+import asyncio
+from datetime import timedelta
+import logging
+import time
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .breaker import STATE_CLOSED, STATE_OPEN
+from .const import (
+    ATTR_FAN_SPEED,
+    ATTR_MAC_ADDRESS,
+    ATTR_MODEL,
+    ATTR_POWER,
+    ATTR_PRESET_MODE,
+    ATTR_SESSION_KEY,
+    PHILIPS_MAC_ADDRESS,
+    PHILIPS_MODEL_NAME,
+    PHILIPS_POWER,
+    PHILIPS_POWER_OFF,
+    POWER_MAP,
+)
+from .decoder import DeviceSnapshot, decode
+from .history import ReadingHistory
+from .http_client import PhilipsAirSupersededError
+from .model_config import (
+    DEVICE_CONFIG_CHANGE_TO_MANUAL,
+    DEVICE_CONFIG_ENDPOINTS,
+    DEVICE_CONFIG_FIELDS,
+    DEVICE_CONFIG_SPEED_PERCENTAGES,
+    DEVICE_CONFIG_SPEEDS,
+    async_get_model_config,
+    unsupported_keys,
+)
+from .scheduler import ENDPOINT_FILTERS, ENDPOINT_FIRMWARE, ENDPOINT_STATUS
+from .write_queue import WriteQueue
+
+_LOGGER = logging.getLogger(__name__)
+
+# Snapshot values that only change when someone controls the device
+CONTROL_ATTRIBUTES = (ATTR_POWER, ATTR_PRESET_MODE, ATTR_FAN_SPEED)
+# Shortest wait between updates. A zero update_interval disables Home
+# Assistant's scheduled updates altogether, so endpoints that are already
+# due wait this long instead
+MIN_UPDATE_INTERVAL = 1
+
+
+class PhilipsAirPurifierCoordinator(DataUpdateCoordinator):
+    """Poll a device once and share the result with all of its entities.
+
+    ``data`` is the decoded snapshot of the device. Entities are only
+    notified when the snapshot changes.
+    """
+
+    def __init__(self, hass, client, store, scheduler, write_delay, device_id):
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=client.host,
+            update_interval=timedelta(
+                seconds=max(scheduler.seconds_until_due(), MIN_UPDATE_INTERVAL)
+            ),
+            always_update=False,
+        )
+        self.client = client
+        self.device_id = device_id
+        self.history = ReadingHistory()
+        self._store = store
+        self._scheduler = scheduler
+        self._write_queue = WriteQueue(hass, self._async_write_values, write_delay)
+
+        # Model never changes at runtime, its profile is loaded by async_load_model
+        self.model = store.get(client.host, ATTR_MODEL)
+        self.model_config = None
+        self.mac_address = store.get(client.host, ATTR_MAC_ADDRESS)
+        if self.model is not None:
+            scheduler.record_success(ENDPOINT_FIRMWARE)
+        client.add_rekey_listener(self._invalidate_model)
+        client.add_key_listener(self._store_session_key)
+
+    @property
+    def host(self):
+        """Return the device host."""
+        return self.client.host
+
+    async def async_shutdown(self):
+        """Stop polling and drop writes that were not sent yet."""
+        self._write_queue.cancel()
+        await super().async_shutdown()
+
+    async def async_load_model(self):
+        """Load the profile of the device model, before entities are set up."""
+        await self._async_set_model(self.model)
+
+    def restore_snapshot(self):
+        """Start from the last snapshot saved for the device, marked as stale.
+
+        Entities show the last known state right away instead of waiting for
+        the device to answer.
+        """
+        values = self._store.get_snapshot(self.host)
+        if values is not None:
+            self.data = DeviceSnapshot(
+                values, self.model, self.speed_percentages, stale=True
+            )
+
+    async def async_set_values(self, values):
+        """Send new values to the device and return its new status.
+
+        Values set by several callers in quick succession are sent together.
+        Values the model doesn't support are rejected without a request.
+        """
+        unsupported = unsupported_keys(self.model_config, values)
+        if unsupported:
+            raise HomeAssistantError(
+                f"{self.model} doesn't support setting {', '.join(unsupported)}"
+            )
+        return await self._write_queue.async_set_values(values)
+
+    async def async_request_status_refresh(self):
+        """Refresh the device status regardless of its schedule."""
+        self._scheduler.request_refresh(ENDPOINT_STATUS)
+        await self.async_request_refresh()
+
+    async def async_refresh_status(self):
+        """Read the device status right away, without debouncing."""
+        self._scheduler.request_refresh(ENDPOINT_STATUS)
+        await self.async_refresh()
+
+    async def _async_write_values(self, values):
+        try:
+            status = await self.client.async_set_values(values)
+        except Exception:
+            # The write may have superseded a status poll, don't wait a full
+            # interval to find out what state the device is in
+            self._scheduler.request_refresh(ENDPOINT_STATUS)
+            self._schedule_next_update()
+            self._schedule_refresh()
+            raise
+
+        # The device answers with its full status, apply it instead of polling
+        if (
+            self.data is not None
+            and PHILIPS_POWER in status
+            and all(key in status for key in values)
+        ):
+            self._apply_status(status)
+        else:
+            await self.async_request_status_refresh()
+
+        return status
+
+    async def _async_update_data(self):
+        breaker_state = self.client.breaker.state
+        if breaker_state == STATE_OPEN:
+            self._schedule_next_update()
+            raise UpdateFailed(
+                f"{self.host} is unreachable, retrying in "
+                f"{self.update_interval.total_seconds():.0f} seconds"
+            )
+
+        if breaker_state == STATE_CLOSED:
+            endpoints = self._scheduler.due_endpoints()
+            if self.model is None:
+                endpoints.add(ENDPOINT_FIRMWARE)
+        else:
+            # Probe an unreachable device with a single request, the other
+            # endpoints follow as soon as it answers
+            endpoints = {ENDPOINT_STATUS}
+
+        fetchers = {
+            ENDPOINT_STATUS: self.client.async_get_status,
+            ENDPOINT_FILTERS: self.client.async_get_filters,
+            ENDPOINT_FIRMWARE: self.client.async_get_firmware,
+        }
+        endpoints = list(endpoints)
+        results = await asyncio.gather(
+            *(fetchers[endpoint]() for endpoint in endpoints),
+            return_exceptions=True,
+        )
+
+        responses = {}
+        errors = {}
+        for endpoint, result in zip(endpoints, results):
+            if isinstance(result, PhilipsAirSupersededError):
+                # A command is being sent and its answer updates the status.
+                # Poll again soon in case the command fails
+                self._scheduler.request_refresh(endpoint)
+                continue
+            if isinstance(result, Exception):
+                errors[endpoint] = result
+                self._scheduler.record_failure(endpoint)
+            else:
+                responses[endpoint] = result
+
+        if ENDPOINT_FIRMWARE in responses:
+            await self._async_update_firmware(responses[ENDPOINT_FIRMWARE])
+
+        snapshot = self._decode(responses)
+        changed = snapshot != self.data
+        if changed:
+            self._store_snapshot(snapshot)
+        if ENDPOINT_STATUS in responses:
+            self.history.append(time.time(), snapshot)
+        for endpoint in responses:
+            self._scheduler.record_success(endpoint, self._is_off(snapshot))
+        if self._controls_changed(snapshot):
+            # Changed from the device or its app, follow what happens next
+            self._scheduler.burst(ENDPOINT_STATUS)
+        self._schedule_next_update()
+
+        if ENDPOINT_STATUS in errors:
+            raise UpdateFailed(
+                f"Error updating the fan: {errors[ENDPOINT_STATUS]}"
+            ) from errors[ENDPOINT_STATUS]
+
+        # Filters and model are secondary: keep the last known values
+        for endpoint, error in errors.items():
+            _LOGGER.warning("Error updating the fan %s: %s", endpoint, error)
+
+        return snapshot
+
+    def _apply_status(self, status):
+        """Apply the full status the device answered a write with."""
+        snapshot = self._decode({ENDPOINT_STATUS: status})
+        changed = snapshot != self.data
+        if changed:
+            self._store_snapshot(snapshot)
+        self.history.append(time.time(), snapshot)
+        self._scheduler.record_success(ENDPOINT_STATUS, self._is_off(snapshot))
+        # No burst: the answer to our own write already carries the status
+        self._schedule_next_update()
+
+        if changed:
+            self.async_set_updated_data(snapshot)
+        else:
+            self._schedule_refresh()
+
+    def _controls_changed(self, snapshot):
+        # Differences from a restored snapshot happened while not running
+        if self.data is None or self.data.stale:
+            return False
+        return any(
+            snapshot.get(attribute) != self.data.get(attribute)
+            for attribute in CONTROL_ATTRIBUTES
+        )
+
+    def _schedule_next_update(self):
+        if self.client.breaker.state == STATE_OPEN:
+            seconds = self.client.breaker.seconds_until_probe()
+        else:
+            seconds = self._scheduler.seconds_until_due()
+        self.update_interval = timedelta(seconds=max(seconds, MIN_UPDATE_INTERVAL))
+
+    def _decode(self, responses):
+        return decode(
+            responses,
+            self.data,
+            self.model,
+            self.speed_percentages,
+            self.model_config[DEVICE_CONFIG_FIELDS],
+        )
+
+    @staticmethod
+    def _is_off(snapshot):
+        return snapshot.get(ATTR_POWER) == POWER_MAP[PHILIPS_POWER_OFF]
+
+    async def _async_update_firmware(self, firmware):
+        if firmware.get(PHILIPS_MODEL_NAME) is not None:
+            await self._async_set_model(firmware[PHILIPS_MODEL_NAME])
+            self._store.set(self.host, ATTR_MODEL, self.model)
+        if firmware.get(PHILIPS_MAC_ADDRESS) is not None:
+            self.mac_address = firmware[PHILIPS_MAC_ADDRESS]
+            self._store.set(self.host, ATTR_MAC_ADDRESS, self.mac_address)
+
+    async def _async_set_model(self, model):
+        self.model = model
+        self.model_config = await async_get_model_config(self.hass, model)
+        self.speed_names = self.model_config[DEVICE_CONFIG_SPEEDS]
+        self.speed_percentages = self.model_config[DEVICE_CONFIG_SPEED_PERCENTAGES]
+        self.should_change_to_manual = self.model_config[DEVICE_CONFIG_CHANGE_TO_MANUAL]
+        # Don't poll endpoints without any value the model supports
+        self._scheduler.set_enabled(self.model_config[DEVICE_CONFIG_ENDPOINTS])
+
+    def _store_snapshot(self, snapshot):
+        self._store.set_snapshot(self.host, dict(snapshot))
+
+    def _store_session_key(self, session_key):
+        """Keep the session key so a restart doesn't need a new key exchange."""
+        self._store.set(self.host, ATTR_SESSION_KEY, session_key.hex())
+
+    def _invalidate_model(self):
+        """Forget the cached model so it is re-read on the next update.
+
+        The profile of the model is kept until the firmware answers.
+        """
+        _LOGGER.debug("Device %s re-paired, re-reading its model", self.host)
+        self.model = None
+        self._store.remove(self.host, ATTR_MODEL)
+        self._scheduler.request_refresh(ENDPOINT_FIRMWARE)
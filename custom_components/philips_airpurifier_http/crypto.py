@@ -0,0 +1,25 @@
+"""AES primitives of the Philips AirPurifier HTTP protocol.
+
+Kept apart from http_client so Cryptodome is only imported once a client
+is needed, see http_client.async_import_crypto.
+"""
+
+from Cryptodome.Cipher import AES
+from Cryptodome.Util.Padding import pad, unpad as _unpad
+
+# The protocol uses AES-CBC with a zero initialization vector
+IV = bytes(16)
+
+
+def aes_encrypt(data, key):
+    """Pad and encrypt data."""
+    return AES.new(key, AES.MODE_CBC, IV).encrypt(pad(data, 16, style="pkcs7"))
+
+
+def aes_decrypt(data, key, unpad=False):
+    """Decrypt data, removing its padding if unpad is set.
+
+    Raises ValueError for data that wasn't encrypted with key.
+    """
+    payload = AES.new(key, AES.MODE_CBC, IV).decrypt(data)
+    return _unpad(payload, 16, style="pkcs7") if unpad else payload
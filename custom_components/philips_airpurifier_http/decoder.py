@@ -0,0 +1,186 @@
+"""Decoding of Philips API responses into device snapshots."""
+
+from collections import namedtuple
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from .const import (
+    ATTR_ALLERGEN_INDEX,
+    ATTR_CARBON_FILTER,
+    ATTR_CHILD_LOCK,
+    ATTR_DISPLAY_LIGHT,
+    ATTR_FAN_SPEED,
+    ATTR_FUNCTION,
+    ATTR_HEPA_FILTER,
+    ATTR_HUMIDITY,
+    ATTR_LIGHT_BRIGHTNESS,
+    ATTR_MODEL,
+    ATTR_PM25,
+    ATTR_POWER,
+    ATTR_PRE_FILTER,
+    ATTR_PRESET_MODE,
+    ATTR_STALE,
+    ATTR_TARGET_HUMIDITY,
+    ATTR_TEMPERATURE,
+    ATTR_TIMER,
+    ATTR_TIMER_REMAINGING_MINUTES,
+    ATTR_USED_INDEX,
+    ATTR_WATER_LEVEL,
+    ATTR_WICK_FILTER,
+    DISPLAY_LIGHT_MAP,
+    FUNCTION_MAP,
+    MODE_MAP,
+    PHILIPS_ALLERGEN_INDEX,
+    PHILIPS_CARBON_FILTER,
+    PHILIPS_CHILD_LOCK,
+    PHILIPS_DISPLAY_LIGHT,
+    PHILIPS_FUNCTION,
+    PHILIPS_HEPA_FILTER,
+    PHILIPS_HUMIDITY,
+    PHILIPS_LIGHT_BRIGHTNESS,
+    PHILIPS_MODE,
+    PHILIPS_PM25,
+    PHILIPS_POWER,
+    PHILIPS_PRE_FILTER,
+    PHILIPS_SPEED,
+    PHILIPS_TARGET_HUMIDITY,
+    PHILIPS_TEMPERATURE,
+    PHILIPS_TIMER,
+    PHILIPS_TIMER_REMAINING,
+    PHILIPS_USED_INDEX,
+    PHILIPS_WATER_LEVEL,
+    PHILIPS_WICK_FILTER,
+    POWER_MAP,
+    SPEED_MAP,
+    USED_INDEX_MAP,
+)
+from .scheduler import ENDPOINT_FILTERS, ENDPOINT_STATUS
+
+Field = namedtuple("Field", ["endpoint", "philips_key", "attribute", "value_map"])
+
+FIELDS = (
+    Field(ENDPOINT_STATUS, PHILIPS_POWER, ATTR_POWER, POWER_MAP),
+    Field(ENDPOINT_STATUS, PHILIPS_PM25, ATTR_PM25, None),
+    Field(ENDPOINT_STATUS, PHILIPS_HUMIDITY, ATTR_HUMIDITY, None),
+    Field(ENDPOINT_STATUS, PHILIPS_TARGET_HUMIDITY, ATTR_TARGET_HUMIDITY, None),
+    Field(ENDPOINT_STATUS, PHILIPS_ALLERGEN_INDEX, ATTR_ALLERGEN_INDEX, None),
+    Field(ENDPOINT_STATUS, PHILIPS_TEMPERATURE, ATTR_TEMPERATURE, None),
+    Field(ENDPOINT_STATUS, PHILIPS_FUNCTION, ATTR_FUNCTION, FUNCTION_MAP),
+    Field(ENDPOINT_STATUS, PHILIPS_MODE, ATTR_PRESET_MODE, MODE_MAP),
+    Field(ENDPOINT_STATUS, PHILIPS_SPEED, ATTR_FAN_SPEED, SPEED_MAP),
+    Field(ENDPOINT_STATUS, PHILIPS_LIGHT_BRIGHTNESS, ATTR_LIGHT_BRIGHTNESS, None),
+    Field(
+        ENDPOINT_STATUS, PHILIPS_DISPLAY_LIGHT, ATTR_DISPLAY_LIGHT, DISPLAY_LIGHT_MAP
+    ),
+    Field(ENDPOINT_STATUS, PHILIPS_USED_INDEX, ATTR_USED_INDEX, USED_INDEX_MAP),
+    Field(ENDPOINT_STATUS, PHILIPS_WATER_LEVEL, ATTR_WATER_LEVEL, None),
+    Field(ENDPOINT_STATUS, PHILIPS_CHILD_LOCK, ATTR_CHILD_LOCK, None),
+    Field(ENDPOINT_STATUS, PHILIPS_TIMER, ATTR_TIMER, None),
+    Field(
+        ENDPOINT_STATUS, PHILIPS_TIMER_REMAINING, ATTR_TIMER_REMAINGING_MINUTES, None
+    ),
+    Field(ENDPOINT_FILTERS, PHILIPS_PRE_FILTER, ATTR_PRE_FILTER, None),
+    Field(ENDPOINT_FILTERS, PHILIPS_WICK_FILTER, ATTR_WICK_FILTER, None),
+    Field(ENDPOINT_FILTERS, PHILIPS_CARBON_FILTER, ATTR_CARBON_FILTER, None),
+    Field(ENDPOINT_FILTERS, PHILIPS_HEPA_FILTER, ATTR_HEPA_FILTER, None),
+)
+
+# Snapshot values exposed as fan attributes, in display order
+FAN_ATTRIBUTES = (
+    ATTR_FUNCTION,
+    ATTR_USED_INDEX,
+    ATTR_PM25,
+    ATTR_ALLERGEN_INDEX,
+    ATTR_TEMPERATURE,
+    ATTR_HUMIDITY,
+    ATTR_TARGET_HUMIDITY,
+    ATTR_WATER_LEVEL,
+    ATTR_LIGHT_BRIGHTNESS,
+    ATTR_DISPLAY_LIGHT,
+    ATTR_CHILD_LOCK,
+    ATTR_TIMER,
+    ATTR_TIMER_REMAINGING_MINUTES,
+    ATTR_PRE_FILTER,
+    ATTR_WICK_FILTER,
+    ATTR_CARBON_FILTER,
+    ATTR_HEPA_FILTER,
+)
+
+
+class DeviceSnapshot(Mapping):
+    """Immutable decoded state of a device.
+
+    Besides the decoded values, the fan attributes and speed percentage are
+    computed once here so every entity reading the snapshot shares them.
+    A ``stale`` snapshot was restored from storage and not yet confirmed by
+    the device.
+    """
+
+    __slots__ = ("_values", "attributes", "percentage", "stale")
+
+    def __init__(self, values, model=None, speed_percentages=None, stale=False):
+        attributes = {}
+        if model is not None:
+            attributes[ATTR_MODEL] = model
+        if stale:
+            attributes[ATTR_STALE] = True
+        for attribute in FAN_ATTRIBUTES:
+            if values.get(attribute) is not None:
+                attributes[attribute] = values[attribute]
+
+        percentage = (speed_percentages or {}).get(values.get(ATTR_FAN_SPEED))
+
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "attributes", MappingProxyType(attributes))
+        object.__setattr__(self, "percentage", percentage)
+        object.__setattr__(self, "stale", stale)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DeviceSnapshot is immutable")
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __eq__(self, other):
+        if not isinstance(other, DeviceSnapshot):
+            return NotImplemented
+        return (
+            self._values == other._values
+            and self.attributes == other.attributes
+            and self.percentage == other.percentage
+        )
+
+    __hash__ = None
+
+
+EMPTY_SNAPSHOT = DeviceSnapshot({})
+
+
+def decode(responses, previous=None, model=None, speed_percentages=None, fields=FIELDS):
+    """Decode endpoint responses into a snapshot.
+
+    ``responses`` maps endpoints to the JSON they returned. Values missing
+    from the responses are carried over from the ``previous`` snapshot.
+    ``model`` and ``speed_percentages`` are used for the precomputed attributes.
+    Only ``fields`` are decoded, the ones the model supports. A stale
+    ``previous`` snapshot stays stale until the device status is read.
+    """
+    values = dict(previous or {})
+    for endpoint, philips_key, attribute, value_map in fields:
+        response = responses.get(endpoint)
+        if response is None or philips_key not in response:
+            continue
+
+        value = response[philips_key]
+        if value_map is not None:
+            value = value_map.get(value, value)
+        values[attribute] = value
+
+    stale = previous is not None and previous.stale and ENDPOINT_STATUS not in responses
+    return DeviceSnapshot(values, model, speed_percentages, stale)
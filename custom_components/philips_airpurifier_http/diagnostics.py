@@ -0,0 +1,22 @@
+"""Diagnostics support for philips_airpurifier_http."""
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_HOST, "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return diagnostics for a purifier."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "model": coordinator.model,
+        "last_update_success": coordinator.last_update_success,
+        "update_interval": coordinator.update_interval.total_seconds(),
+        "circuit_breaker": coordinator.client.breaker.state,
+        "metrics": coordinator.client.metrics.as_dict(),
+        "data": dict(coordinator.data) if coordinator.data is not None else None,
+    }
@@ -0,0 +1,61 @@
+"""Base entity for philips_airpurifier_http device values."""
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, MANUFACTURER
+
+
+def device_info(coordinator, name):
+    """Return the device shared by all entities of a purifier."""
+    info = DeviceInfo(
+        identifiers={(DOMAIN, coordinator.device_id)},
+        name=name,
+        manufacturer=MANUFACTURER,
+        model=coordinator.model,
+    )
+    if coordinator.mac_address is not None:
+        info["connections"] = {(CONNECTION_NETWORK_MAC, coordinator.mac_address)}
+    return info
+
+
+async def async_write_values(coordinator, values):
+    """Send values to a device, raising a HomeAssistantError if that fails.
+
+    The coordinator already refreshes the device state after a failed write.
+    """
+    try:
+        return await coordinator.async_set_values(values)
+    except HomeAssistantError:
+        # Rejected before reaching the device, e.g. unsupported by the model
+        raise
+    except Exception as exc:
+        raise HomeAssistantError(f"Error setting new values: {exc}") from exc
+
+
+class PhilipsAirPurifierEntity(CoordinatorEntity):
+    """Expose a single value of a device polled by a coordinator.
+
+    The entity description's ``key`` is the snapshot key of the value.
+    """
+
+    def __init__(self, coordinator, name, description):
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_name = f"{name} {description.name}"
+        self._attr_unique_id = f"{coordinator.device_id}_{description.key}"
+        self._attr_device_info = device_info(coordinator, name)
+
+    @property
+    def available(self):
+        """Return True when the device reports this value."""
+        return super().available and self._value is not None
+
+    async def _async_set_values(self, values):
+        await async_write_values(self.coordinator, values)
+
+    @property
+    def _value(self):
+        data = self.coordinator.data or {}
+        return data.get(self.entity_description.key)
@@ -0,0 +1,83 @@
+"""Load control shared by all philips_airpurifier_http devices."""
+
+import asyncio
+from contextlib import asynccontextmanager
+import time
+
+from .const import (
+    DATA_PHILIPS_FLEET,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+)
+
+# Seconds over which the first polls of the devices are spread
+STAGGER_WINDOW = 10
+# Fractional part of the golden ratio, spreads any number of offsets evenly
+GOLDEN_RATIO = 0.6180339887
+
+
+def get_fleet_limiter(hass):
+    """Return the shared fleet limiter, creating it on first use."""
+    if DATA_PHILIPS_FLEET not in hass.data:
+        hass.data[DATA_PHILIPS_FLEET] = FleetLimiter()
+    return hass.data[DATA_PHILIPS_FLEET]
+
+
+class TokenBucket:
+    """Allow rate events per second on average, with bursts of capacity."""
+
+    def __init__(self, rate, capacity):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    async def async_acquire(self):
+        """Wait until an event is allowed, then take its token."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class FleetLimiter:
+    """Bound the requests in flight to all devices, and their rate.
+
+    Requests to a single device are already sent one at a time, this keeps
+    a large fleet from loading Home Assistant's host all at once.
+    """
+
+    def __init__(
+        self,
+        max_concurrent=DEFAULT_MAX_CONCURRENT_REQUESTS,
+        max_per_second=DEFAULT_MAX_REQUESTS_PER_SECOND,
+    ):
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._bucket = TokenBucket(max_per_second, max(1, max_per_second))
+        self._devices = 0
+
+    @asynccontextmanager
+    async def async_request(self):
+        """Hold a fleet-wide request slot while sending a request."""
+        async with self._semaphore:
+            await self._bucket.async_acquire()
+            yield
+
+    def next_start_offset(self, interval, restored=False):
+        """Return how long a newly set up device waits before its first poll.
+
+        Offsets of successive devices are spread evenly over the stagger
+        window, or over the interval if it is shorter. Devices that start
+        from a restored snapshot aren't in a hurry, they are spread over the
+        whole interval.
+        """
+        # Start the sequence at 1, the first device would get no offset at all
+        self._devices += 1
+        offset = (self._devices * GOLDEN_RATIO) % 1
+        return offset * (interval if restored else min(interval, STAGGER_WINDOW))
@@ -0,0 +1,176 @@
+"""In-memory history of the air quality readings of a device."""
+
+from array import array
+from collections import deque
+import math
+
+from .const import ATTR_ALLERGEN_INDEX, ATTR_HUMIDITY, ATTR_PM25, ATTR_TEMPERATURE
+
+# Snapshot values kept in the history
+HISTORY_ATTRIBUTES = (ATTR_PM25, ATTR_ALLERGEN_INDEX, ATTR_HUMIDITY, ATTR_TEMPERATURE)
+# Number of readings kept per device. The time they span depends on how
+# often the status is read, which varies with bursts and backoff
+HISTORY_SIZE = 720
+# Window in seconds of the statistics exposed as sensor attributes
+SUMMARY_WINDOW = 60 * 60
+
+
+class RunningSummary:
+    """Min, max and mean of a sliding window of readings.
+
+    Readings are added newest last and removed oldest first, each in
+    amortized constant time. The candidates for the minimum and maximum are
+    kept in monotonic queues of (sequence number, value) pairs.
+    """
+
+    def __init__(self):
+        self._total = 0.0
+        self._count = 0
+        self._minimum = deque()
+        self._maximum = deque()
+
+    def add(self, sequence, value):
+        """Add the newest reading."""
+        self._total += value
+        self._count += 1
+        while self._minimum and self._minimum[-1][1] >= value:
+            self._minimum.pop()
+        self._minimum.append((sequence, value))
+        while self._maximum and self._maximum[-1][1] <= value:
+            self._maximum.pop()
+        self._maximum.append((sequence, value))
+
+    def remove(self, sequence, value):
+        """Remove the oldest reading."""
+        self._count -= 1
+        # Start over from zero so rounding errors don't pile up
+        self._total = self._total - value if self._count else 0.0
+        if self._minimum[0][0] == sequence:
+            self._minimum.popleft()
+        if self._maximum[0][0] == sequence:
+            self._maximum.popleft()
+
+    def as_dict(self):
+        """Return the statistics, or None without readings."""
+        if not self._count:
+            return None
+        return {
+            "min": self._minimum[0][1],
+            "max": self._maximum[0][1],
+            "mean": round(self._total / self._count, 2),
+            "count": self._count,
+        }
+
+
+class ReadingHistory:
+    """Fixed size ring buffer of timestamped readings.
+
+    Readings are stored in preallocated arrays of doubles, so the memory used
+    doesn't grow with uptime. Values a device doesn't report are NaN. The
+    statistics of the last hour are kept up to date as readings come and go.
+    """
+
+    def __init__(
+        self, size=HISTORY_SIZE, attributes=HISTORY_ATTRIBUTES, window=SUMMARY_WINDOW
+    ):
+        self._size = size
+        self._window = window
+        self._timestamps = array("d", [math.nan]) * size
+        self._values = {
+            attribute: array("d", [math.nan]) * size for attribute in attributes
+        }
+        self._next = 0
+        self._count = 0
+        # Readings are numbered in the order they were appended
+        self._appended = 0
+        self._summary_start = 0
+        self._summaries = {attribute: RunningSummary() for attribute in attributes}
+
+    def __len__(self):
+        return self._count
+
+    def append(self, timestamp, snapshot):
+        """Record the readings of a snapshot taken at timestamp."""
+        self._expire_summaries(timestamp)
+
+        index = self._next
+        self._timestamps[index] = timestamp
+        for attribute, values in self._values.items():
+            value = snapshot.get(attribute)
+            values[index] = math.nan if value is None else float(value)
+            if value is not None:
+                self._summaries[attribute].add(self._appended, values[index])
+
+        self._next = (index + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+        self._appended += 1
+
+    def summary(self, attribute):
+        """Return the statistics of an attribute over the last hour."""
+        return self._summaries[attribute].as_dict()
+
+    def statistics(self, attribute, window, now):
+        """Return min, max and mean of an attribute over the last window seconds."""
+        total = 0.0
+        count = 0
+        minimum = math.inf
+        maximum = -math.inf
+        for _, value in self._readings(attribute, now - window):
+            total += value
+            count += 1
+            minimum = min(minimum, value)
+            maximum = max(maximum, value)
+
+        if not count:
+            return None
+        return {
+            "min": minimum,
+            "max": maximum,
+            "mean": round(total / count, 2),
+            "count": count,
+        }
+
+    def downsample(self, attribute, window, bucket, now):
+        """Return the mean of an attribute per bucket seconds, oldest first.
+
+        Only buckets with readings are returned, as (start, mean) pairs.
+        """
+        buckets = {}
+        for timestamp, value in self._readings(attribute, now - window):
+            start = timestamp - timestamp % bucket
+            total, count = buckets.get(start, (0.0, 0))
+            buckets[start] = (total + value, count + 1)
+
+        return [
+            (start, round(total / count, 2))
+            for start, (total, count) in sorted(buckets.items())
+        ]
+
+    def _expire_summaries(self, now):
+        """Remove readings from the summaries that leave the window.
+
+        Readings leave once they are too old, or when the next reading
+        overwrites them in the buffer.
+        """
+        while self._summary_start < self._appended and (
+            self._summary_start <= self._appended - self._size
+            or self._timestamps[self._summary_start % self._size] < now - self._window
+        ):
+            index = self._summary_start % self._size
+            for attribute, values in self._values.items():
+                if not math.isnan(values[index]):
+                    self._summaries[attribute].remove(
+                        self._summary_start, values[index]
+                    )
+            self._summary_start += 1
+
+    def _readings(self, attribute, since):
+        """Yield the timestamp and value of readings taken since a time."""
+        values = self._values[attribute]
+        first = (self._next - self._count) % self._size
+        for offset in range(self._count):
+            index = (first + offset) % self._size
+            timestamp = self._timestamps[index]
+            value = values[index]
+            if timestamp >= since and not math.isnan(value):
+                yield timestamp, value
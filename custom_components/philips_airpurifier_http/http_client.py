@@ -0,0 +1,274 @@
+"""Asyncio client for the Philips AirPurifier HTTP protocol."""
+
+import asyncio
+import base64
+import importlib
+import json
+import logging
+import random
+import time
+
+import aiohttp
+
+from .breaker import CircuitBreaker
+from .metrics import ClientMetrics
+from .request_queue import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    RequestQueue,
+    RequestSupersededError,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Diffie-Hellman group used by the device (RFC 5114, 1024-bit MODP group)
+DH_G = int(
+    "A4D1CBD5C3FD34126765A442EFB99905F8104DD258AC507FD6406CFF14266D31"
+    "266FEA1E5C41564B777E690F5504F213160217B4B01B886A5E91547F9E2749F4"
+    "D7FBD7D3B9A92EE1909D0D2263F80A76A6A24C087A091F531DBF0A0169B6A28A"
+    "D662A4D18E73AFA32D779D5918D08BC8858F4DCEF97C2A24855E6EEB22B3B2E5",
+    16,
+)
+DH_P = int(
+    "B10B8F96A080E01DDE92DE5EAE5D54EC52C99FBCFB06A3C69A6A9DCA52D23B61"
+    "6073E28675A23D189838EF1E2EE652C013ECB4AEA906112324975C3CD49B83BF"
+    "ACCBDD7D90C4BD7098488E9C219A73724EFFD6FAE5644738FAA31A4FF55BCCC0"
+    "A151AF5F0DC8B4BD45BF37DF365C1A65E68CFDA76D4DA708DF1FB2BC2E4A4371",
+    16,
+)
+
+PATH_SECURITY = "/di/v1/products/0/security"
+PATH_FIRMWARE = "/di/v1/products/0/firmware"
+PATH_STATUS = "/di/v1/products/1/air"
+PATH_FILTERS = "/di/v1/products/1/fltsts"
+
+DEFAULT_TIMEOUT = 10
+
+# Module wrapping Cryptodome, imported once the first client is needed
+CRYPTO_MODULE = f"{__package__}.crypto"
+
+
+class PhilipsAirClientError(Exception):
+    """Raised when the device cannot be reached or returns an invalid response."""
+
+
+class PhilipsAirDecryptError(PhilipsAirClientError):
+    """Raised when a response cannot be decrypted with the current session key."""
+
+
+class PhilipsAirUnreachableError(PhilipsAirClientError):
+    """Raised without sending a request while the device is unreachable."""
+
+
+class PhilipsAirSupersededError(PhilipsAirClientError):
+    """Raised for a status request dropped in favour of a command.
+
+    The command's answer carries the status, so this isn't a failure.
+    """
+
+
+async def async_import_crypto(hass):
+    """Import the crypto stack in the executor, before building a client.
+
+    Setups without any device never pay for it, and the import doesn't
+    block the event loop.
+    """
+    await hass.async_add_import_executor_job(importlib.import_module, CRYPTO_MODULE)
+
+
+def _crypto():
+    # Already imported by async_import_crypto, this is a sys.modules lookup
+    return importlib.import_module(CRYPTO_MODULE)
+
+
+def encrypt(values, key):
+    """Encrypt a dict of values into a device request body."""
+    # The device expects two random bytes in front of the payload
+    data = "AA" + json.dumps(values)
+    return base64.b64encode(_crypto().aes_encrypt(bytearray(data, "ascii"), key))
+
+
+def decrypt(data, key):
+    """Decrypt a device response body into a dict."""
+    try:
+        payload = _crypto().aes_decrypt(base64.b64decode(data), key, unpad=True)
+        # Responses start with two random bytes, exclude them
+        return json.loads(payload[2:].decode("ascii"))
+    except ValueError as exc:
+        raise PhilipsAirDecryptError("Unable to decrypt device response") from exc
+
+
+class AsyncHTTPAirClient:
+    """Talk to a Philips AirPurifier over HTTP without blocking the event loop."""
+
+    def __init__(
+        self, host, session, session_key=None, timeout=DEFAULT_TIMEOUT, limiter=None
+    ):
+        self._host = host
+        self._session = session
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session_key = session_key
+        self._key_lock = asyncio.Lock()
+        self._key_listeners = []
+        self._rekey_listeners = []
+        self.metrics = ClientMetrics()
+        self.breaker = CircuitBreaker()
+        self._queue = RequestQueue()
+        self._limiter = limiter
+
+    @property
+    def host(self):
+        """Return the device host."""
+        return self._host
+
+    def add_key_listener(self, listener):
+        """Call listener with every newly negotiated session key."""
+        self._key_listeners.append(listener)
+
+    def add_rekey_listener(self, listener):
+        """Call listener when the device rejects the session key.
+
+        This happens when the device was rebooted or re-paired, so anything
+        cached about it may be outdated.
+        """
+        self._rekey_listeners.append(listener)
+
+    async def async_get_status(self):
+        """Fetch the device status."""
+        return await self._async_get(PATH_STATUS)
+
+    async def async_get_filters(self):
+        """Fetch the device filter status."""
+        return await self._async_get(PATH_FILTERS)
+
+    async def async_get_firmware(self):
+        """Fetch the device firmware information."""
+        return await self._async_get(PATH_FIRMWARE)
+
+    async def async_set_values(self, values):
+        """Send new values to the device and return the resulting status.
+
+        Commands are sent ahead of waiting polls, and supersede status polls.
+        """
+        return await self._async_call("PUT", PATH_STATUS, values, PRIORITY_COMMAND)
+
+    async def _async_get(self, path):
+        return await self._async_call("GET", path)
+
+    async def _async_call(self, method, path, values=None, priority=PRIORITY_POLL):
+        """Send an encrypted request, renegotiating the key only if rejected."""
+        session_key = await self._async_ensure_key(priority)
+        try:
+            return await self._async_send(method, path, values, session_key, priority)
+        except PhilipsAirDecryptError:
+            _LOGGER.debug("Session key for %s rejected, renegotiating", self._host)
+
+        session_key = await self._async_exchange_key(session_key, priority)
+        return await self._async_send(method, path, values, session_key, priority)
+
+    async def _async_send(self, method, path, values, session_key, priority):
+        data = None if values is None else encrypt(values, session_key)
+        body = await self._async_request(method, path, data, priority)
+        return decrypt(body, session_key)
+
+    async def _async_ensure_key(self, priority):
+        if self._session_key is not None:
+            return self._session_key
+        return await self._async_exchange_key(None, priority)
+
+    async def _async_exchange_key(self, stale_key, priority):
+        async with self._key_lock:
+            # Another request may have renegotiated while we were waiting
+            if self._session_key is not None and self._session_key != stale_key:
+                return self._session_key
+
+            _LOGGER.debug("Exchanging secret key with %s", self._host)
+            secret = random.getrandbits(256)
+            diffie = format(pow(DH_G, secret, DH_P), "x")
+            body = await self._async_request(
+                "PUT", PATH_SECURITY, json.dumps({"diffie": diffie}), priority
+            )
+
+            try:
+                exchange = json.loads(body)
+                hellman = int(exchange["hellman"], 16)
+                shared = pow(hellman, secret, DH_P).to_bytes(128, byteorder="big")
+                key = _crypto().aes_decrypt(bytes.fromhex(exchange["key"]), shared[:16])
+            except (KeyError, ValueError) as exc:
+                raise PhilipsAirClientError(
+                    f"Invalid key exchange response from {self._host}"
+                ) from exc
+
+            self._session_key = key[:16]
+            self.metrics.key_exchanges += 1
+
+        for listener in self._key_listeners:
+            listener(self._session_key)
+
+        if stale_key is not None:
+            for listener in self._rekey_listeners:
+                listener()
+
+        return self._session_key
+
+    async def _async_request(self, method, path, data, priority):
+        """Send a request once the device is free, one request at a time."""
+        try:
+            return await self._queue.async_run(
+                lambda: self._async_http_request(method, path, data),
+                priority,
+                # A command answers with the status, polling it meanwhile is moot
+                supersedable=method == "GET" and path == PATH_STATUS,
+            )
+        except RequestSupersededError as exc:
+            raise PhilipsAirSupersededError(
+                f"Status request to {self._host} superseded by a command"
+            ) from exc
+
+    async def _async_http_request(self, method, path, data):
+        if self._limiter is None:
+            return await self._async_send_http_request(method, path, data)
+        async with self._limiter.async_request():
+            return await self._async_send_http_request(method, path, data)
+
+    async def _async_send_http_request(self, method, path, data):
+        if not self.breaker.try_acquire():
+            raise PhilipsAirUnreachableError(
+                f"{self._host} is unreachable, retrying in "
+                f"{self.breaker.seconds_until_probe():.0f} seconds"
+            )
+
+        url = f"http://{self._host}{path}"
+        metrics = self.metrics.endpoint(path)
+        start = time.monotonic()
+        try:
+            async with self._session.request(
+                method, url, data=data, timeout=self._timeout
+            ) as response:
+                response.raise_for_status()
+                body = await response.text()
+        except Exception as exc:  # pylint: disable=broad-except
+            # Unreachable, or answering with something that isn't a response.
+            # Cancellation isn't an Exception, it says nothing about the device
+            timeout = isinstance(exc, asyncio.TimeoutError)
+            metrics.record_error(timeout=timeout)
+            self._record_failure()
+            reason = "Timeout" if timeout else "Error"
+            raise PhilipsAirClientError(f"{reason} talking to {self._host}") from exc
+        finally:
+            # A probe that was neither answered nor failed, e.g. cancelled,
+            # must not keep the breaker from probing again
+            self.breaker.release()
+
+        metrics.record_success(time.monotonic() - start)
+        if self.breaker.record_success():
+            _LOGGER.info("%s is reachable again", self._host)
+        return body
+
+    def _record_failure(self):
+        if self.breaker.record_failure():
+            _LOGGER.warning(
+                "%s is unreachable, pausing requests for %.0f seconds",
+                self._host,
+                self.breaker.seconds_until_probe(),
+            )
@@ -0,0 +1,90 @@
+"""Request metrics of a philips_airpurifier_http device."""
+
+from datetime import datetime, timezone
+
+# Upper bounds in seconds of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class EndpointMetrics:
+    """Count requests to a single device endpoint and how long they took."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.latency_total = 0.0
+        # One bucket per bound plus one for slower requests
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.last_success = None
+
+    @property
+    def average_latency(self):
+        """Return the average latency of successful requests in seconds."""
+        successes = self.requests - self.errors - self.timeouts
+        return self.latency_total / successes if successes else None
+
+    def record_success(self, latency):
+        """Record a request that was answered after latency seconds."""
+        self.requests += 1
+        self.latency_total += latency
+        for bucket, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                break
+        else:
+            bucket = len(LATENCY_BUCKETS)
+        self.latency_histogram[bucket] += 1
+        self.last_success = datetime.now(timezone.utc)
+
+    def record_error(self, timeout=False):
+        """Record a request that failed or timed out."""
+        self.requests += 1
+        if timeout:
+            self.timeouts += 1
+        else:
+            self.errors += 1
+
+    def as_dict(self):
+        """Return the metrics as a JSON serializable dict."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "average_latency": self.average_latency,
+            "latency_histogram": dict(
+                zip([*map(str, LATENCY_BUCKETS), "+Inf"], self.latency_histogram)
+            ),
+            "last_success": (
+                self.last_success.isoformat() if self.last_success else None
+            ),
+        }
+
+
+class ClientMetrics:
+    """Request metrics of a device, per endpoint path."""
+
+    def __init__(self):
+        self.endpoints = {}
+        self.key_exchanges = 0
+
+    def endpoint(self, path):
+        """Return the metrics of an endpoint, creating them on first use."""
+        if path not in self.endpoints:
+            self.endpoints[path] = EndpointMetrics()
+        return self.endpoints[path]
+
+    @property
+    def failures(self):
+        """Return the number of failed and timed out requests."""
+        return sum(
+            metrics.errors + metrics.timeouts for metrics in self.endpoints.values()
+        )
+
+    def as_dict(self):
+        """Return the metrics as a JSON serializable dict."""
+        return {
+            "key_exchanges": self.key_exchanges,
+            "endpoints": {
+                path: metrics.as_dict() for path, metrics in self.endpoints.items()
+            },
+        }
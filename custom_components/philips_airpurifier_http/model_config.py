@@ -1,40 +1,88 @@
-from .const import *
+import json
+from pathlib import Path
 
-# Device models
-DEVICE_MODEL_AC2729_10 = "AC2729_10"
-DEVICE_MODEL_AC2889_10 = "AC2889_10"
-DEVICE_MODEL_AC3259_10 = "AC3259_10"
-DEFAULT_MODEL = "DEFAULT"
+from homeassistant.util.percentage import ordered_list_item_to_percentage
 
+from .decoder import FIELDS
+from .scheduler import ENDPOINT_FIRMWARE
+
+# Profile of models without one of their own
+DEFAULT_MODEL = "default"
+
+# Directory of the model profiles, one <model>.json file per model
+MODELS_PATH = Path(__file__).parent / "models"
+
+# Keys of a model profile
 DEVICE_CONFIG_MODES = "device_modes"
 DEVICE_CONFIG_SPEEDS = "device_speeds"
 DEVICE_CONFIG_CHANGE_TO_MANUAL = "change_to_manual_mode"
+DEVICE_CONFIG_KEYS = "supported_keys"
+
+# Keys computed when a profile is loaded
+DEVICE_CONFIG_SPEED_PERCENTAGES = "device_speed_percentages"
+DEVICE_CONFIG_FIELDS = "device_fields"
+DEVICE_CONFIG_ATTRIBUTES = "device_attributes"
+DEVICE_CONFIG_ENDPOINTS = "device_endpoints"
+
+# Loaded profiles by model, shared by all devices of a model
+_MODEL_CONFIGS = {}
+
+
+def _profile_path(model):
+    path = MODELS_PATH / f"{model}.json"
+    # Models come from the device, don't let them point outside the directory
+    if model is None or path.parent != MODELS_PATH or not path.is_file():
+        return MODELS_PATH / f"{DEFAULT_MODEL}.json"
+    return path
+
+
+def load_model_config(model):
+    """Load the profile of a model, falling back to the default profile.
+
+    Does blocking I/O, run it in the executor.
+    """
+    with open(_profile_path(model), encoding="utf-8") as file:
+        model_config = json.load(file)
+
+    keys = model_config.get(DEVICE_CONFIG_KEYS)
+    # Profiles without supported keys allow everything, e.g. unknown models
+    if keys is not None:
+        model_config[DEVICE_CONFIG_KEYS] = frozenset(keys)
+
+    # Precompute the percentage of every speed so decoding is a dict lookup
+    model_config[DEVICE_CONFIG_SPEED_PERCENTAGES] = {
+        speed: ordered_list_item_to_percentage(
+            model_config[DEVICE_CONFIG_SPEEDS], speed
+        )
+        for speed in model_config[DEVICE_CONFIG_SPEEDS]
+    }
+
+    fields = tuple(
+        field for field in FIELDS if keys is None or field.philips_key in keys
+    )
+    model_config[DEVICE_CONFIG_FIELDS] = fields
+    model_config[DEVICE_CONFIG_ATTRIBUTES] = frozenset(
+        field.attribute for field in fields
+    )
+    model_config[DEVICE_CONFIG_ENDPOINTS] = frozenset(
+        {ENDPOINT_FIRMWARE, *(field.endpoint for field in fields)}
+    )
+    return model_config
+
+
+async def async_get_model_config(hass, model):
+    """Return the profile of a model, loading it on first use."""
+    key = model or DEFAULT_MODEL
+    if key not in _MODEL_CONFIGS:
+        _MODEL_CONFIGS[key] = await hass.async_add_executor_job(
+            load_model_config, model
+        )
+    return _MODEL_CONFIGS[key]
+
 
-MODELS = {
-    DEVICE_MODEL_AC2729_10: {
-        DEVICE_CONFIG_MODES: [MODE_ALLERGEN, MODE_AUTO, MODE_MANUAL, MODE_SLEEP],
-        DEVICE_CONFIG_SPEEDS: ALL_SPEEDS,
-        DEVICE_CONFIG_CHANGE_TO_MANUAL: False,
-    },
-    DEVICE_MODEL_AC2889_10: {
-        DEVICE_CONFIG_MODES: [MODE_ALLERGEN, MODE_AUTO, MODE_MANUAL, MODE_BACTERIA],
-        DEVICE_CONFIG_SPEEDS: ALL_SPEEDS,
-        DEVICE_CONFIG_CHANGE_TO_MANUAL: True,
-    },
-    DEVICE_MODEL_AC3259_10: {
-        DEVICE_CONFIG_MODES: [
-            MODE_ALLERGEN,
-            MODE_AUTO,
-            MODE_MANUAL,
-            MODE_SLEEP,
-            MODE_BACTERIA,
-        ],
-        DEVICE_CONFIG_SPEEDS: ALL_SPEEDS,
-        DEVICE_CONFIG_CHANGE_TO_MANUAL: True,
-    },
-    DEFAULT_MODEL: {
-        DEVICE_CONFIG_MODES: ALL_MODES,
-        DEVICE_CONFIG_SPEEDS: ALL_SPEEDS,
-        DEVICE_CONFIG_CHANGE_TO_MANUAL: True,
-    },
-}
+def unsupported_keys(model_config, values):
+    """Return the keys of values the model doesn't support."""
+    keys = model_config[DEVICE_CONFIG_KEYS]
+    if keys is None:
+        return []
+    return [key for key in values if key not in keys]
@@ -0,0 +1,75 @@
+"""Numbers for Philips Air Purifiers and Humidifiers."""
+
+from dataclasses import dataclass
+
+from homeassistant.components.number import NumberEntity, NumberEntityDescription
+from homeassistant.const import CONF_NAME, PERCENTAGE, UnitOfTime
+
+from .const import (
+    ATTR_TARGET_HUMIDITY,
+    ATTR_TIMER,
+    DOMAIN,
+    PHILIPS_TARGET_HUMIDITY,
+    PHILIPS_TIMER,
+    TARGET_HUMIDITY_LIST,
+)
+from .entity import PhilipsAirPurifierEntity
+from .model_config import DEVICE_CONFIG_ATTRIBUTES
+
+
+@dataclass(frozen=True, kw_only=True)
+class PhilipsNumberEntityDescription(NumberEntityDescription):
+    """Describe a Philips device number."""
+
+    philips_key: str
+
+
+NUMBER_TYPES = (
+    PhilipsNumberEntityDescription(
+        key=ATTR_TARGET_HUMIDITY,
+        philips_key=PHILIPS_TARGET_HUMIDITY,
+        name="Target humidity",
+        icon="mdi:water-percent",
+        native_min_value=min(TARGET_HUMIDITY_LIST),
+        native_max_value=max(TARGET_HUMIDITY_LIST),
+        native_step=10,
+        native_unit_of_measurement=PERCENTAGE,
+    ),
+    PhilipsNumberEntityDescription(
+        key=ATTR_TIMER,
+        philips_key=PHILIPS_TIMER,
+        name="Timer",
+        icon="mdi:timer-outline",
+        native_min_value=0,
+        native_max_value=12,
+        native_step=1,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+    ),
+)
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up numbers for a configured purifier."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    # Only the values the device model supports
+    attributes = coordinator.model_config[DEVICE_CONFIG_ATTRIBUTES]
+    async_add_entities(
+        PhilipsAirPurifierNumber(coordinator, entry.data[CONF_NAME], description)
+        for description in NUMBER_TYPES
+        if description.key in attributes
+    )
+
+
+class PhilipsAirPurifierNumber(PhilipsAirPurifierEntity, NumberEntity):
+    """A numeric device setting."""
+
+    @property
+    def native_value(self):
+        """Return the current value."""
+        if self._value is not None:
+            return int(self._value)
+        return None
+
+    async def async_set_native_value(self, value):
+        """Send a new value to the device."""
+        await self._async_set_values({self.entity_description.philips_key: int(value)})
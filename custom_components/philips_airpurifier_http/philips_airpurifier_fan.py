@@ -1,183 +1,115 @@
 import logging
-from functools import partial
 
 from homeassistant.components.fan import (
     FanEntity,
     FanEntityFeature,
 )
-from homeassistant.util.percentage import (
-    ordered_list_item_to_percentage,
-    percentage_to_ordered_list_item,
-)
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util.percentage import percentage_to_ordered_list_item
 
 from .const import (
-    ATTR_ALLERGEN_INDEX,
-    ATTR_CARBON_FILTER,
-    ATTR_CHILD_LOCK,
-    ATTR_DISPLAY_LIGHT,
-    ATTR_FUNCTION,
-    ATTR_HEPA_FILTER,
-    ATTR_HUMIDITY,
-    ATTR_LIGHT_BRIGHTNESS,
-    ATTR_MODEL,
-    ATTR_PM25,
-    ATTR_PRE_FILTER,
-    ATTR_TARGET_HUMIDITY,
-    ATTR_TEMPERATURE,
-    ATTR_TIMER_REMAINGING_MINUTES,
-    ATTR_TIMER,
-    ATTR_USED_INDEX,
-    ATTR_WATER_LEVEL,
-    ATTR_WICK_FILTER,
+    ATTR_POWER,
+    ATTR_PRESET_MODE,
     DEFAULT_ICON,
     DISPLAY_LIGHT_MAP,
     FUNCTION_MAP,
     MODE_MANUAL,
     MODE_MAP,
-    PHILIPS_ALLERGEN_INDEX,
     PHILIPS_CHILD_LOCK,
     PHILIPS_DISPLAY_LIGHT,
     PHILIPS_FUNCTION,
-    PHILIPS_HUMIDITY,
     PHILIPS_LIGHT_BRIGHTNESS,
     PHILIPS_MODE,
-    PHILIPS_MODEL_NAME,
-    PHILIPS_PM25,
     PHILIPS_POWER,
+    PHILIPS_POWER_OFF,
+    PHILIPS_POWER_ON,
     PHILIPS_SPEED,
     PHILIPS_TARGET_HUMIDITY,
-    PHILIPS_TEMPERATURE,
-    PHILIPS_TIMER_REMAINING,
     PHILIPS_TIMER,
     PHILIPS_USED_INDEX,
-    PHILIPS_WATER_LEVEL,
+    SERVICE_ATTR_BRIGHTNESS_LEVEL,
+    SERVICE_ATTR_CHILD_LOCK,
+    SERVICE_ATTR_DISPLAY_LIGHT,
+    SERVICE_ATTR_FUNCTION,
+    SERVICE_ATTR_HUMIDITY,
+    SERVICE_ATTR_PERCENTAGE,
+    SERVICE_ATTR_POWER,
+    SERVICE_ATTR_PRESET_MODE,
+    SERVICE_ATTR_TIMER_HOURS,
+    SERVICE_ATTR_USED_INDEX,
     SPEED_MAP,
     USED_INDEX_MAP,
 )
 
-from .model_config import (
-    DEFAULT_MODEL,
-    DEVICE_CONFIG_MODES,
-    DEVICE_CONFIG_SPEEDS,
-    MODELS,
-    DEVICE_CONFIG_CHANGE_TO_MANUAL,
-)
+from .decoder import EMPTY_SNAPSHOT
+from .entity import async_write_values, device_info
+from .model_config import DEVICE_CONFIG_MODES
+from .registry import get_fan_registry
 
 _LOGGER = logging.getLogger(__name__)
 
-
-class PhilipsAirPurifierFan(FanEntity):
+# Builders of the device values for each apply_state attribute
+STATE_VALUES = {
+    SERVICE_ATTR_POWER: "_power_values",
+    SERVICE_ATTR_PERCENTAGE: "_percentage_values",
+    SERVICE_ATTR_PRESET_MODE: "_preset_mode_values",
+    SERVICE_ATTR_FUNCTION: "_function_values",
+    SERVICE_ATTR_HUMIDITY: "_target_humidity_values",
+    SERVICE_ATTR_BRIGHTNESS_LEVEL: "_light_brightness_values",
+    SERVICE_ATTR_CHILD_LOCK: "_child_lock_values",
+    SERVICE_ATTR_TIMER_HOURS: "_timer_values",
+    SERVICE_ATTR_DISPLAY_LIGHT: "_display_light_values",
+    SERVICE_ATTR_USED_INDEX: "_used_index_values",
+}
+
+
+class PhilipsAirPurifierFan(CoordinatorEntity, FanEntity):
     """philips_aurpurifier fan entity."""
 
-    def __init__(self, hass, client, name):
-        self.hass = hass
-        self._client = client
+    def __init__(self, coordinator, name):
+        super().__init__(coordinator)
         self._name = name
-
-        self._available = False
-        self._state = None
-        self._model = None
-        self._session_key = None
-
-        self._fan_speed = None
-        self._preset_mode = None
-
-        self._pre_filter = None
-        self._wick_filter = None
-        self._carbon_filter = None
-        self._hepa_filter = None
-
-        self._pm25 = None
-        self._humidity = None
-        self._target_humidity = None
-        self._allergen_index = None
-        self._temperature = None
-        self._function = None
-        self._light_brightness = None
-        self._display_light = None
-        self._used_index = None
-        self._water_level = None
-        self._child_lock = None
-        self._timer = None
-        self._timer_remaining = None
+        self._attr_unique_id = coordinator.device_id
+        self._attr_device_info = device_info(coordinator, name)
 
     ### Update Fan attributes ###
 
+    async def async_added_to_hass(self):
+        """Subscribe to coordinator updates."""
+        await super().async_added_to_hass()
+        get_fan_registry(self.hass).add(self)
+
+    async def async_will_remove_from_hass(self):
+        """Unregister the fan."""
+        await super().async_will_remove_from_hass()
+        get_fan_registry(self.hass).remove(self)
+
     async def async_update(self):
         """Fetch state from device."""
-        try:
-            await self._update_filters()
-            await self._update_state()
-            await self._update_model()
-            self._available = True
-        except Exception:
-            _LOGGER.error("Error updating the fan.", exc_info=True)
-            self._available = False
-
-    async def _update_filters(self):
-        filters = await self.hass.async_add_executor_job(self._client.get_filters)
-        self._pre_filter = filters["fltsts0"]
-        if "wicksts" in filters:
-            self._wick_filter = filters["wicksts"]
-        self._carbon_filter = filters["fltsts2"]
-        self._hepa_filter = filters["fltsts1"]
-
-    async def _update_model(self):
-        firmware = await self.hass.async_add_executor_job(self._client.get_firmware)
-        if PHILIPS_MODEL_NAME in firmware:
-            self._model = firmware[PHILIPS_MODEL_NAME]
-
-    async def _update_state(self):
-        status = await self.hass.async_add_executor_job(self._client.get_status)
-        if PHILIPS_POWER in status:
-            self._state = "on" if status[PHILIPS_POWER] == "1" else "off"
-        if PHILIPS_PM25 in status:
-            self._pm25 = status[PHILIPS_PM25]
-        if PHILIPS_HUMIDITY in status:
-            self._humidity = status[PHILIPS_HUMIDITY]
-        if PHILIPS_TARGET_HUMIDITY in status:
-            self._target_humidity = status[PHILIPS_TARGET_HUMIDITY]
-        if PHILIPS_ALLERGEN_INDEX in status:
-            self._allergen_index = status[PHILIPS_ALLERGEN_INDEX]
-        if PHILIPS_TEMPERATURE in status:
-            self._temperature = status[PHILIPS_TEMPERATURE]
-        if PHILIPS_FUNCTION in status:
-            func = status[PHILIPS_FUNCTION]
-            self._function = FUNCTION_MAP.get(func, func)
-        if PHILIPS_MODE in status:
-            mode = status[PHILIPS_MODE]
-            self._preset_mode = MODE_MAP.get(mode, mode)
-        if PHILIPS_SPEED in status:
-            speed = status[PHILIPS_SPEED]
-            self._fan_speed = SPEED_MAP.get(speed, speed)
-        if PHILIPS_LIGHT_BRIGHTNESS in status:
-            self._light_brightness = status[PHILIPS_LIGHT_BRIGHTNESS]
-        if PHILIPS_DISPLAY_LIGHT in status:
-            display_light = status[PHILIPS_DISPLAY_LIGHT]
-            self._display_light = DISPLAY_LIGHT_MAP.get(display_light, display_light)
-        if PHILIPS_USED_INDEX in status:
-            ddp = status[PHILIPS_USED_INDEX]
-            self._used_index = USED_INDEX_MAP.get(ddp, ddp)
-        if PHILIPS_WATER_LEVEL in status:
-            self._water_level = status[PHILIPS_WATER_LEVEL]
-        if PHILIPS_CHILD_LOCK in status:
-            self._child_lock = status[PHILIPS_CHILD_LOCK]
-        if PHILIPS_TIMER in status:
-            self._timer = status[PHILIPS_TIMER]
-        if PHILIPS_TIMER_REMAINING in status:
-            self._timer_remaining = status[PHILIPS_TIMER_REMAINING]
+        await self.coordinator.async_request_status_refresh()
+
+    @callback
+    def _handle_coordinator_update(self):
+        get_fan_registry(self.hass).index_mac_address(self)
+        super()._handle_coordinator_update()
+
+    @property
+    def _snapshot(self):
+        return self.coordinator.data or EMPTY_SNAPSHOT
 
     ### Properties ###
 
     @property
     def state(self):
         """Return device state."""
-        return self._state
+        return self._snapshot.get(ATTR_POWER)
 
     @property
     def available(self):
         """Return True when state is known."""
-        return self._available
+        return super().available and self.coordinator.data is not None
 
     @property
     def name(self):
@@ -192,22 +124,17 @@ class PhilipsAirPurifierFan(FanEntity):
     @property
     def percentage(self) -> int:
         """Return the current percentage."""
-
-        if self._fan_speed != "0":
-            percentage = ordered_list_item_to_percentage(
-                self._speed_names, self._fan_speed
-            )
-            return percentage
+        return self._snapshot.percentage
 
     @property
     def preset_modes(self) -> [str]:
         """Return all available preset modes."""
-        return self._model_config.get(DEVICE_CONFIG_MODES)
+        return self.coordinator.model_config.get(DEVICE_CONFIG_MODES)
 
     @property
     def preset_mode(self) -> str:
         """Return the current preset mode."""
-        return self._preset_mode
+        return self._snapshot.get(ATTR_PRESET_MODE)
 
     @property
     def supported_features(self) -> int:
@@ -221,151 +148,136 @@ class PhilipsAirPurifierFan(FanEntity):
 
     @property
     def speed_count(self) -> int:
-        return len(self._speed_names)
+        return len(self.coordinator.speed_names)
 
     async def async_turn_on(self, percentage=None, preset_mode=None, **kwargs) -> None:
-        """Turn on the fan."""
-
-        values = {PHILIPS_POWER: "1"}
-        await self._async_set_values(values)
+        """Turn on the fan, with its mode or speed in the same request."""
 
+        values = self._power_values(True)
         if preset_mode is not None:
-            await self.async_set_preset_mode(preset_mode)
+            if MODE_MAP.encode(preset_mode) is not None:
+                values.update(self._preset_mode_values(preset_mode))
+            else:
+                _LOGGER.warning('Unsupported preset mode "%s"', preset_mode)
         elif percentage is not None:
-            await self.async_set_percentage(percentage)
+            values.update(self._percentage_values(percentage))
+
+        await self._async_set_values(values)
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn off the fan."""
-        values = {PHILIPS_POWER: "0"}
-        await self._async_set_values(values)
+        await self._async_set_values(self._power_values(False))
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed percentage of the fan."""
-
-        if percentage == 0:
-            await self.async_turn_off()
-            return
-
-        speed_name = percentage_to_ordered_list_item(self._speed_names, percentage)
-        speed = self._find_key(SPEED_MAP, speed_name)
-        values = {PHILIPS_SPEED: speed}
-
-        if self._should_change_to_manual:
-            values[PHILIPS_MODE] = self._find_key(MODE_MAP, MODE_MANUAL)
-
-        await self._async_set_values(values)
+        await self._async_set_values(self._percentage_values(percentage))
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set a preset mode on the fan."""
 
-        if preset_mode in MODE_MAP.values():
-            philips_mode = self._find_key(MODE_MAP, preset_mode)
-            await self._async_set_values({PHILIPS_MODE: philips_mode})
+        if MODE_MAP.encode(preset_mode) is not None:
+            await self._async_set_values(self._preset_mode_values(preset_mode))
         else:
             _LOGGER.warning('Unsupported preset mode "%s"', preset_mode)
 
     async def async_set_used_index(self, used_index: str) -> None:
         """Set the used_index of the fan."""
-        philips_used_index = self._find_key(USED_INDEX_MAP, used_index)
-        await self._async_set_values({PHILIPS_USED_INDEX: philips_used_index})
+        await self._async_set_values(self._used_index_values(used_index))
 
     async def async_set_function(self, function: str):
         """Set the function of the fan."""
-        philips_function = self._find_key(FUNCTION_MAP, function)
-        await self._async_set_values({PHILIPS_FUNCTION: philips_function})
+        await self._async_set_values(self._function_values(function))
 
     async def async_set_target_humidity(self, humidity: int):
         """Set the target humidity of the fan."""
-        await self._async_set_values({PHILIPS_TARGET_HUMIDITY: humidity})
+        await self._async_set_values(self._target_humidity_values(humidity))
 
     async def async_set_light_brightness(self, level: int):
         """Set the light brightness of the fan."""
-        values = {}
-        values[PHILIPS_LIGHT_BRIGHTNESS] = level
-        values[PHILIPS_DISPLAY_LIGHT] = self._find_key(DISPLAY_LIGHT_MAP, level != 0)
-        await self._async_set_values(values)
+        await self._async_set_values(self._light_brightness_values(level))
 
     async def async_set_child_lock(self, lock: bool):
         """Set the child lock of the fan."""
-        await self._async_set_values({PHILIPS_CHILD_LOCK: lock})
+        await self._async_set_values(self._child_lock_values(lock))
 
     async def async_set_timer(self, hours: int):
         """Set the off timer of the fan."""
-        await self._async_set_values({PHILIPS_TIMER: hours})
+        await self._async_set_values(self._timer_values(hours))
 
     async def async_set_display_light(self, light: bool):
         """Set the display light of the fan."""
-        light = self._find_key(DISPLAY_LIGHT_MAP, light)
-        await self._async_set_values({PHILIPS_DISPLAY_LIGHT: light})
+        await self._async_set_values(self._display_light_values(light))
+
+    async def async_apply_state(self, **state):
+        """Set any number of values at once, in a single request.
+
+        Values the device model doesn't support are rejected before anything
+        is sent.
+        """
+        preset_mode = state.get(SERVICE_ATTR_PRESET_MODE)
+        if preset_mode is not None and preset_mode not in (self.preset_modes or ()):
+            raise HomeAssistantError(
+                f"{self.entity_id} doesn't support preset mode {preset_mode}"
+            )
 
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes of the device."""
-        attr = {}
-
-        if self._model is not None:
-            attr[ATTR_MODEL] = self._model
-        if self._function is not None:
-            attr[ATTR_FUNCTION] = self._function
-        if self._used_index is not None:
-            attr[ATTR_USED_INDEX] = self._used_index
-        if self._pm25 is not None:
-            attr[ATTR_PM25] = self._pm25
-        if self._allergen_index is not None:
-            attr[ATTR_ALLERGEN_INDEX] = self._allergen_index
-        if self._temperature is not None:
-            attr[ATTR_TEMPERATURE] = self._temperature
-        if self._humidity is not None:
-            attr[ATTR_HUMIDITY] = self._humidity
-        if self._target_humidity is not None:
-            attr[ATTR_TARGET_HUMIDITY] = self._target_humidity
-        if self._water_level is not None:
-            attr[ATTR_WATER_LEVEL] = self._water_level
-        if self._light_brightness is not None:
-            attr[ATTR_LIGHT_BRIGHTNESS] = self._light_brightness
-        if self._display_light is not None:
-            attr[ATTR_DISPLAY_LIGHT] = self._display_light
-        if self._child_lock is not None:
-            attr[ATTR_CHILD_LOCK] = self._child_lock
-        if self._timer is not None:
-            attr[ATTR_TIMER] = self._timer
-        if self._timer_remaining is not None:
-            attr[ATTR_TIMER_REMAINGING_MINUTES] = self._timer_remaining
-        if self._pre_filter is not None:
-            attr[ATTR_PRE_FILTER] = self._pre_filter
-        if self._wick_filter is not None:
-            attr[ATTR_WICK_FILTER] = self._wick_filter
-        if self._carbon_filter is not None:
-            attr[ATTR_CARBON_FILTER] = self._carbon_filter
-        if self._hepa_filter is not None:
-            attr[ATTR_HEPA_FILTER] = self._hepa_filter
-
-        return attr
+        # Merged in STATE_VALUES order, so an explicit preset mode wins over
+        # the manual mode a speed change may ask for
+        values = {}
+        for attribute, builder in STATE_VALUES.items():
+            if attribute in state:
+                values.update(getattr(self, builder)(state[attribute]))
+        await self._async_set_values(values)
 
-    async def _async_set_values(self, values):
-        try:
-            await self.hass.async_add_executor_job(
-                partial(self._client.set_values, values)
-            )
-        except Exception as exc:
-            _LOGGER.error("Error setting new values.", exc)
-            self._available = False
-            return False
+    ### Device values ###
 
-    def _find_key(self, value_map, search_value):
-        if search_value in value_map.values():
-            return [key for key, value in value_map.items() if value == search_value][0]
+    def _power_values(self, power):
+        return {PHILIPS_POWER: PHILIPS_POWER_ON if power else PHILIPS_POWER_OFF}
 
-        return None
+    def _percentage_values(self, percentage):
+        if percentage == 0:
+            return self._power_values(False)
 
-    @property
-    def _model_config(self):
-        return MODELS.get(self._model, MODELS.get(DEFAULT_MODEL))
+        speed_name = percentage_to_ordered_list_item(
+            self.coordinator.speed_names, percentage
+        )
+        values = {PHILIPS_SPEED: SPEED_MAP.encode(speed_name)}
 
-    @property
-    def _speed_names(self):
-        return self._model_config.get(DEVICE_CONFIG_SPEEDS)
+        if self.coordinator.should_change_to_manual:
+            values[PHILIPS_MODE] = MODE_MAP.encode(MODE_MANUAL)
+
+        return values
+
+    def _preset_mode_values(self, preset_mode):
+        return {PHILIPS_MODE: MODE_MAP.encode(preset_mode)}
+
+    def _used_index_values(self, used_index):
+        return {PHILIPS_USED_INDEX: USED_INDEX_MAP.encode(used_index)}
+
+    def _function_values(self, function):
+        return {PHILIPS_FUNCTION: FUNCTION_MAP.encode(function)}
+
+    def _target_humidity_values(self, humidity):
+        return {PHILIPS_TARGET_HUMIDITY: humidity}
+
+    def _light_brightness_values(self, level):
+        return {
+            PHILIPS_LIGHT_BRIGHTNESS: level,
+            PHILIPS_DISPLAY_LIGHT: DISPLAY_LIGHT_MAP.encode(level != 0),
+        }
+
+    def _child_lock_values(self, lock):
+        return {PHILIPS_CHILD_LOCK: lock}
+
+    def _timer_values(self, hours):
+        return {PHILIPS_TIMER: hours}
+
+    def _display_light_values(self, light):
+        return {PHILIPS_DISPLAY_LIGHT: DISPLAY_LIGHT_MAP.encode(light)}
 
     @property
-    def _should_change_to_manual(self):
-        return self._model_config.get(DEVICE_CONFIG_CHANGE_TO_MANUAL)
+    def extra_state_attributes(self):
+        """Return the state attributes of the device."""
+        return self._snapshot.attributes
+
+    async def _async_set_values(self, values):
+        await async_write_values(self.coordinator, values)
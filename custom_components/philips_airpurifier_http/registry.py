@@ -0,0 +1,62 @@
+"""Lookup of philips_airpurifier_http fan entities."""
+
+from .const import DATA_PHILIPS_FANS
+
+
+def get_fan_registry(hass):
+    """Return the shared fan registry, creating it on first use."""
+    if DATA_PHILIPS_FANS not in hass.data:
+        hass.data[DATA_PHILIPS_FANS] = PhilipsFanRegistry()
+    return hass.data[DATA_PHILIPS_FANS]
+
+
+class PhilipsFanRegistry:
+    """Index fan entities by entity_id, host and MAC address."""
+
+    def __init__(self):
+        self._by_entity_id = {}
+        self._by_host = {}
+        self._by_mac_address = {}
+
+    def __iter__(self):
+        return iter(list(self._by_entity_id.values()))
+
+    def __len__(self):
+        return len(self._by_entity_id)
+
+    def add(self, fan):
+        """Register a fan that was added to Home Assistant."""
+        self._by_entity_id[fan.entity_id] = fan
+        self._by_host[fan.coordinator.host] = fan
+        self.index_mac_address(fan)
+
+    def index_mac_address(self, fan):
+        """Index a fan by its MAC address once the address is known."""
+        mac_address = fan.coordinator.mac_address
+        if mac_address is not None:
+            self._by_mac_address[mac_address] = fan
+
+    def remove(self, fan):
+        """Unregister a fan that is being removed from Home Assistant.
+
+        Every key the fan is indexed under is dropped, including the ones
+        it was indexed under before its MAC address changed.
+        """
+        for index in (self._by_entity_id, self._by_host, self._by_mac_address):
+            for key in [key for key, indexed in index.items() if indexed is fan]:
+                del index[key]
+
+    def get(self, entity_id):
+        """Return the fan with the given entity_id."""
+        return self._by_entity_id.get(entity_id)
+
+    def resolve(self, entity_ids):
+        """Return the fans matching entity_ids, or all fans if none are given."""
+        if not entity_ids:
+            return list(self)
+
+        return [
+            self._by_entity_id[entity_id]
+            for entity_id in entity_ids
+            if entity_id in self._by_entity_id
+        ]
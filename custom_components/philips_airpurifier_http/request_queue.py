@@ -0,0 +1,92 @@
+"""Prioritized requests to a single philips_airpurifier_http device."""
+
+import asyncio
+import heapq
+import itertools
+
+# Lower values are sent first
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+
+
+class RequestSupersededError(Exception):
+    """Raised for a request dropped because a command makes it stale."""
+
+
+class RequestQueue:
+    """Send the requests to a device one at a time, commands first.
+
+    Devices run a small single-threaded HTTP server that answers concurrent
+    requests slowly or not at all. Requests wait here instead, ordered by
+    priority then arrival. A command supersedes the requests marked as
+    supersedable, dropping them while they wait and cancelling the one
+    already sent.
+    """
+
+    def __init__(self):
+        self._waiters = []
+        self._order = itertools.count()
+        self._busy = False
+        self._active = None
+        self._superseded = set()
+
+    async def async_run(self, request, priority=PRIORITY_POLL, supersedable=False):
+        """Run request, a coroutine function, once no other request is active."""
+        if priority == PRIORITY_COMMAND:
+            self._supersede()
+        await self._async_acquire(priority, supersedable)
+
+        task = asyncio.ensure_future(request())
+        self._active = (task, supersedable)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            # Only translate our own cancellation, not the caller's
+            if task in self._superseded and not asyncio.current_task().cancelling():
+                raise RequestSupersededError from None
+            raise
+        finally:
+            self._superseded.discard(task)
+            self._active = None
+            self._release()
+
+    async def _async_acquire(self, priority, supersedable):
+        if not self._busy:
+            self._busy = True
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters, (priority, next(self._order), future, supersedable)
+        )
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Handed the turn while being cancelled, pass it on
+                self._release()
+            raise
+
+    def _release(self):
+        while self._waiters:
+            future = heapq.heappop(self._waiters)[2]
+            if not future.done():
+                future.set_result(None)
+                return
+        self._busy = False
+
+    def _supersede(self):
+        waiters = []
+        for waiter in self._waiters:
+            future, supersedable = waiter[2], waiter[3]
+            if not supersedable:
+                waiters.append(waiter)
+            elif not future.done():
+                future.set_exception(RequestSupersededError())
+        heapq.heapify(waiters)
+        self._waiters = waiters
+
+        if self._active is not None and self._active[1]:
+            task = self._active[0]
+            self._superseded.add(task)
+            task.cancel()
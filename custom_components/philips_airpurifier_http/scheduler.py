@@ -0,0 +1,87 @@
+"""Tiered polling schedule for philips_airpurifier_http devices."""
+
+import random
+import time
+
+ENDPOINT_STATUS = "status"
+ENDPOINT_FILTERS = "filters"
+ENDPOINT_FIRMWARE = "firmware"
+
+# Multiplier applied to the status interval while the device is turned off
+OFF_BACKOFF = 4
+# Upper bound for the interval multiplier of an endpoint that keeps failing
+MAX_ERROR_BACKOFF = 16
+# Fraction of an interval added or removed at random to spread out a fleet
+JITTER = 0.1
+# Quick polls following a change, to catch the transitions it sets off
+BURST_POLLS = 5
+BURST_INTERVAL = 2
+
+
+class PollScheduler:
+    """Track when each device endpoint is due to be polled again."""
+
+    def __init__(self, intervals, jitter=JITTER, start_offset=None):
+        self._intervals = intervals
+        self._jitter = jitter
+        # Stagger the first poll so devices set up together don't poll together
+        if start_offset is None:
+            start_offset = random.uniform(0, jitter) * min(intervals.values())
+        start = time.monotonic() + start_offset
+        self._due = {endpoint: start for endpoint in intervals}
+        self._backoff = {endpoint: 1 for endpoint in intervals}
+        self._bursts = {endpoint: 0 for endpoint in intervals}
+        self._enabled = set(intervals)
+
+    def due_endpoints(self, now=None):
+        """Return the endpoints that should be polled now."""
+        now = time.monotonic() if now is None else now
+        return {
+            endpoint
+            for endpoint, due in self._due.items()
+            if due <= now and endpoint in self._enabled
+        }
+
+    def seconds_until_due(self, now=None):
+        """Return how long to wait before the next endpoint is due."""
+        now = time.monotonic() if now is None else now
+        due = [self._due[endpoint] for endpoint in self._enabled]
+        return max(0.0, min(due) - now) if due else 0.0
+
+    def set_enabled(self, endpoints):
+        """Only poll the given endpoints, e.g. the ones a model has values on."""
+        self._enabled = set(endpoints) & set(self._intervals)
+
+    def request_refresh(self, endpoint):
+        """Make an endpoint due immediately."""
+        self._due[endpoint] = time.monotonic()
+
+    def burst(self, endpoint):
+        """Poll an endpoint quickly for a while, to follow a change closely."""
+        self._bursts[endpoint] = BURST_POLLS
+        self._due[endpoint] = min(
+            self._due[endpoint], time.monotonic() + BURST_INTERVAL
+        )
+
+    def record_success(self, endpoint, powered_off=False):
+        """Schedule the next poll of an endpoint after a successful read."""
+        backoff = OFF_BACKOFF if powered_off and endpoint == ENDPOINT_STATUS else 1
+        self._backoff[endpoint] = backoff
+
+        if self._bursts[endpoint]:
+            self._bursts[endpoint] -= 1
+            self._due[endpoint] = time.monotonic() + BURST_INTERVAL
+            return
+
+        self._schedule(endpoint, backoff)
+
+    def record_failure(self, endpoint):
+        """Back off exponentially from an endpoint that failed."""
+        backoff = min(self._backoff[endpoint] * 2, MAX_ERROR_BACKOFF)
+        self._backoff[endpoint] = backoff
+        self._schedule(endpoint, backoff)
+
+    def _schedule(self, endpoint, backoff):
+        interval = self._intervals[endpoint] * backoff
+        jitter = random.uniform(-self._jitter, self._jitter)
+        self._due[endpoint] = time.monotonic() + interval * (1 + jitter)
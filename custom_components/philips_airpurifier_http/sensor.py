@@ -0,0 +1,194 @@
+"""Sensors for Philips Air Purifiers and Humidifiers."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
+    CONF_NAME,
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+
+from .const import (
+    ATTR_ALLERGEN_INDEX,
+    ATTR_CARBON_FILTER,
+    ATTR_HEPA_FILTER,
+    ATTR_HUMIDITY,
+    ATTR_PM25,
+    ATTR_PRE_FILTER,
+    ATTR_TEMPERATURE,
+    ATTR_WATER_LEVEL,
+    ATTR_WICK_FILTER,
+    CONF_DIAGNOSTIC_SENSORS,
+    DOMAIN,
+)
+from .entity import PhilipsAirPurifierEntity
+from .history import HISTORY_ATTRIBUTES
+from .http_client import PATH_STATUS
+from .model_config import DEVICE_CONFIG_ATTRIBUTES
+
+FILTER_SENSOR = {
+    "device_class": SensorDeviceClass.DURATION,
+    "native_unit_of_measurement": UnitOfTime.HOURS,
+    "entity_category": EntityCategory.DIAGNOSTIC,
+}
+
+SENSOR_TYPES = (
+    SensorEntityDescription(
+        key=ATTR_PM25,
+        name="PM2.5",
+        device_class=SensorDeviceClass.PM25,
+        native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=ATTR_ALLERGEN_INDEX,
+        name="Allergen index",
+        icon="mdi:blur",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=ATTR_HUMIDITY,
+        name="Humidity",
+        device_class=SensorDeviceClass.HUMIDITY,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=ATTR_TEMPERATURE,
+        name="Temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=ATTR_WATER_LEVEL,
+        name="Water level",
+        icon="mdi:water",
+        native_unit_of_measurement=PERCENTAGE,
+    ),
+    SensorEntityDescription(key=ATTR_PRE_FILTER, name="Pre-filter", **FILTER_SENSOR),
+    SensorEntityDescription(key=ATTR_HEPA_FILTER, name="HEPA filter", **FILTER_SENSOR),
+    SensorEntityDescription(
+        key=ATTR_CARBON_FILTER, name="Carbon filter", **FILTER_SENSOR
+    ),
+    SensorEntityDescription(key=ATTR_WICK_FILTER, name="Wick filter", **FILTER_SENSOR),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class PhilipsDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describe a sensor reading the request metrics of a device."""
+
+    value_fn: Callable[[Any], Any]
+    entity_category: EntityCategory = EntityCategory.DIAGNOSTIC
+
+
+def _status_latency(metrics):
+    latency = metrics.endpoint(PATH_STATUS).average_latency
+    return round(latency * 1000) if latency is not None else None
+
+
+DIAGNOSTIC_SENSOR_TYPES = (
+    PhilipsDiagnosticSensorEntityDescription(
+        key="status_latency",
+        name="Status latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_status_latency,
+    ),
+    PhilipsDiagnosticSensorEntityDescription(
+        key="failed_requests",
+        name="Failed requests",
+        icon="mdi:lan-disconnect",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.failures,
+    ),
+    PhilipsDiagnosticSensorEntityDescription(
+        key="key_exchanges",
+        name="Key exchanges",
+        icon="mdi:key-change",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.key_exchanges,
+    ),
+    PhilipsDiagnosticSensorEntityDescription(
+        key="last_successful_poll",
+        name="Last successful poll",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda metrics: metrics.endpoint(PATH_STATUS).last_success,
+    ),
+)
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up sensors for a configured purifier."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    # Only the values the device model supports
+    attributes = coordinator.model_config[DEVICE_CONFIG_ATTRIBUTES]
+    name = entry.data[CONF_NAME]
+    entities = [
+        PhilipsAirPurifierSensor(coordinator, name, description)
+        for description in SENSOR_TYPES
+        if description.key in attributes
+    ]
+    if entry.options.get(CONF_DIAGNOSTIC_SENSORS):
+        entities.extend(
+            PhilipsAirPurifierDiagnosticSensor(coordinator, name, description)
+            for description in DIAGNOSTIC_SENSOR_TYPES
+        )
+    async_add_entities(entities)
+
+
+class PhilipsAirPurifierSensor(PhilipsAirPurifierEntity, SensorEntity):
+    """A single value reported by the device."""
+
+    # Statistics over the last hour, already in the recorder as states
+    _unrecorded_attributes = frozenset({"min", "max", "mean", "count"})
+
+    @property
+    def native_value(self):
+        """Return the value reported by the device."""
+        return self._value
+
+    @property
+    def extra_state_attributes(self):
+        """Return the statistics of the value over the last hour."""
+        if self.entity_description.key not in HISTORY_ATTRIBUTES:
+            return None
+        return self.coordinator.history.summary(self.entity_description.key)
+
+
+class PhilipsAirPurifierDiagnosticSensor(PhilipsAirPurifierSensor):
+    """A request metric of the device's client.
+
+    Metrics change on every request, not only when the device state does,
+    so these sensors are polled instead of following the coordinator.
+    """
+
+    @property
+    def should_poll(self):
+        """Poll the metrics on the sensor scan interval."""
+        return True
+
+    @property
+    def available(self):
+        """Return True once the metric has a value, even if the device is down."""
+        return self._value is not None
+
+    @property
+    def _value(self):
+        return self.entity_description.value_fn(self.coordinator.client.metrics)
+
+    async def async_update(self):
+        """Read the metrics on the next state write, without polling the device."""
@@ -1,7 +1,19 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import logging
+import time
+
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
+    DOMAIN,
+    SERVICE_DEVICE_TIMEOUT,
+    SERVICE_APPLY_STATE,
+    SERVICE_GET_HISTORY,
+    SERVICE_MAX_CONCURRENCY,
     SERVICE_SET_FUNCTION,
     SERVICE_SET_TARGET_HUMIDITY,
     SERVICE_SET_LIGHT_BRIGHTNESS,
@@ -17,54 +29,83 @@ from .const import (
     SERVICE_ATTR_TIMER_HOURS,
     SERVICE_ATTR_DISPLAY_LIGHT,
     SERVICE_ATTR_USED_INDEX,
+    SERVICE_ATTR_ATTRIBUTE,
+    SERVICE_ATTR_WINDOW,
+    SERVICE_ATTR_BUCKET,
+    SERVICE_ATTR_POWER,
+    SERVICE_ATTR_PERCENTAGE,
+    SERVICE_ATTR_PRESET_MODE,
+    ALL_MODES,
     TARGET_HUMIDITY_LIST,
     LIGHT_BRIGHTNESS_LIST,
     FUNCTION_MAP,
     USED_INDEX_MAP,
 )
+from .history import HISTORY_ATTRIBUTES
+from .registry import get_fan_registry
+
+_LOGGER = logging.getLogger(__name__)
 
 AIRPURIFIER_SERVICE_SCHEMA = vol.Schema(
     {vol.Required(SERVICE_ATTR_ENTITY_ID): cv.entity_ids}
 )
 
-SERVICE_SET_FUNCTION_SCHEMA = AIRPURIFIER_SERVICE_SCHEMA.extend(
-    {vol.Required(SERVICE_ATTR_FUNCTION): vol.In(FUNCTION_MAP.values())}
-)
+# Validators of the values services set, shared by the single value
+# services and apply_state
+VALUE_VALIDATORS = {
+    SERVICE_ATTR_POWER: cv.boolean,
+    SERVICE_ATTR_PERCENTAGE: vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+    SERVICE_ATTR_PRESET_MODE: vol.In(ALL_MODES),
+    SERVICE_ATTR_FUNCTION: vol.In(FUNCTION_MAP.values()),
+    SERVICE_ATTR_HUMIDITY: vol.All(vol.Coerce(int), vol.In(TARGET_HUMIDITY_LIST)),
+    SERVICE_ATTR_BRIGHTNESS_LEVEL: vol.All(
+        vol.Coerce(int), vol.In(LIGHT_BRIGHTNESS_LIST)
+    ),
+    SERVICE_ATTR_CHILD_LOCK: cv.boolean,
+    SERVICE_ATTR_TIMER_HOURS: vol.All(
+        vol.Coerce(int), vol.Number(scale=0), vol.Range(min=0, max=12)
+    ),
+    SERVICE_ATTR_DISPLAY_LIGHT: cv.boolean,
+    SERVICE_ATTR_USED_INDEX: vol.In(USED_INDEX_MAP.values()),
+}
 
-SERVICE_SET_TARGET_HUMIDITY_SCHEMA = AIRPURIFIER_SERVICE_SCHEMA.extend(
-    {
-        vol.Required(SERVICE_ATTR_HUMIDITY): vol.All(
-            vol.Coerce(int), vol.In(TARGET_HUMIDITY_LIST)
-        )
-    }
-)
 
-SERVICE_SET_LIGHT_BRIGHTNESS_SCHEMA = AIRPURIFIER_SERVICE_SCHEMA.extend(
-    {
-        vol.Required(SERVICE_ATTR_BRIGHTNESS_LEVEL): vol.All(
-            vol.Coerce(int), vol.In(LIGHT_BRIGHTNESS_LIST)
-        )
-    }
-)
+def _value_schema(attribute):
+    """Return the schema of a service setting a single value."""
+    return AIRPURIFIER_SERVICE_SCHEMA.extend(
+        {vol.Required(attribute): VALUE_VALIDATORS[attribute]}
+    )
 
-SERVICE_SET_CHILD_LOCK_SCHEMA = AIRPURIFIER_SERVICE_SCHEMA.extend(
-    {vol.Required(SERVICE_ATTR_CHILD_LOCK): cv.boolean}
-)
 
-SERVICE_SET_TIMER_SCHEMA = AIRPURIFIER_SERVICE_SCHEMA.extend(
-    {
-        vol.Required(SERVICE_ATTR_TIMER_HOURS): vol.All(
-            vol.Coerce(int), vol.Number(scale=0), vol.Range(min=0, max=12)
-        )
-    }
-)
+SERVICE_SET_FUNCTION_SCHEMA = _value_schema(SERVICE_ATTR_FUNCTION)
+SERVICE_SET_TARGET_HUMIDITY_SCHEMA = _value_schema(SERVICE_ATTR_HUMIDITY)
+SERVICE_SET_LIGHT_BRIGHTNESS_SCHEMA = _value_schema(SERVICE_ATTR_BRIGHTNESS_LEVEL)
+SERVICE_SET_CHILD_LOCK_SCHEMA = _value_schema(SERVICE_ATTR_CHILD_LOCK)
+SERVICE_SET_TIMER_SCHEMA = _value_schema(SERVICE_ATTR_TIMER_HOURS)
+SERVICE_SET_DISPLAY_LIGHT_SCHEMA = _value_schema(SERVICE_ATTR_DISPLAY_LIGHT)
+SERVICE_SET_USED_INDEX_SCHEMA = _value_schema(SERVICE_ATTR_USED_INDEX)
 
-SERVICE_SET_DISPLAY_LIGHT_SCHEMA = AIRPURIFIER_SERVICE_SCHEMA.extend(
-    {vol.Required(SERVICE_ATTR_DISPLAY_LIGHT): cv.boolean}
+SERVICE_APPLY_STATE_SCHEMA = vol.All(
+    AIRPURIFIER_SERVICE_SCHEMA.extend(
+        {
+            vol.Optional(attribute): validator
+            for attribute, validator in VALUE_VALIDATORS.items()
+        }
+    ),
+    cv.has_at_least_one_key(*VALUE_VALIDATORS),
 )
 
-SERVICE_SET_USED_INDEX_SCHEMA = AIRPURIFIER_SERVICE_SCHEMA.extend(
-    {vol.Required(SERVICE_ATTR_USED_INDEX): vol.In(USED_INDEX_MAP.values())}
+SERVICE_GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(SERVICE_ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(SERVICE_ATTR_ATTRIBUTE): vol.In(HISTORY_ATTRIBUTES),
+        vol.Optional(SERVICE_ATTR_WINDOW, default=timedelta(hours=1)): vol.All(
+            cv.time_period, cv.positive_timedelta
+        ),
+        vol.Optional(SERVICE_ATTR_BUCKET, default=timedelta(minutes=5)): vol.All(
+            cv.time_period, cv.positive_timedelta
+        ),
+    }
 )
 
 
@@ -97,4 +138,101 @@ SERVICE_TO_METHOD = {
         "method": "async_set_used_index",
         "schema": SERVICE_SET_USED_INDEX_SCHEMA,
     },
+    SERVICE_APPLY_STATE: {
+        "method": "async_apply_state",
+        "schema": SERVICE_APPLY_STATE_SCHEMA,
+    },
 }
+
+
+def async_register_services(hass):
+    """Register the domain services shared by all fans."""
+    registry = get_fan_registry(hass)
+
+    async def async_service_handler(service):
+        entity_ids = service.data.get(SERVICE_ATTR_ENTITY_ID)
+        service_method = SERVICE_TO_METHOD.get(service.service)["method"]
+
+        # Params to set to method handler. Drop entity_id.
+        params = {
+            key: value
+            for key, value in service.data.items()
+            if key != SERVICE_ATTR_ENTITY_ID
+        }
+
+        devices = [
+            device
+            for device in registry.resolve(entity_ids)
+            if hasattr(device, service_method)
+        ]
+        semaphore = asyncio.Semaphore(SERVICE_MAX_CONCURRENCY)
+
+        async def async_call_device(device):
+            async with semaphore:
+                async with asyncio.timeout(SERVICE_DEVICE_TIMEOUT):
+                    await getattr(device, service_method)(**params)
+
+        results = await asyncio.gather(
+            *(async_call_device(device) for device in devices),
+            return_exceptions=True,
+        )
+
+        failed = []
+        for device, result in zip(devices, results):
+            if isinstance(result, asyncio.TimeoutError):
+                reason = "timed out"
+            elif isinstance(result, asyncio.CancelledError):
+                reason = "cancelled"
+            elif isinstance(result, BaseException):
+                reason = str(result) or type(result).__name__
+            else:
+                continue
+            _LOGGER.error(
+                "%s on %s failed: %s", service.service, device.entity_id, reason
+            )
+            failed.append(f"{device.entity_id} ({reason})")
+
+        if failed:
+            raise HomeAssistantError(
+                f"{service.service} failed for {len(failed)} of {len(devices)} "
+                f"devices: {', '.join(failed)}"
+            )
+
+    async def async_get_history(service):
+        attribute = service.data[SERVICE_ATTR_ATTRIBUTE]
+        window = service.data[SERVICE_ATTR_WINDOW].total_seconds()
+        bucket = service.data[SERVICE_ATTR_BUCKET].total_seconds()
+        now = time.time()
+
+        response = {}
+        for device in registry.resolve(service.data.get(SERVICE_ATTR_ENTITY_ID)):
+            history = device.coordinator.history
+            response[device.entity_id] = {
+                "statistics": history.statistics(attribute, window, now),
+                "readings": [
+                    {
+                        "time": datetime.fromtimestamp(start, timezone.utc).isoformat(),
+                        "mean": mean,
+                    }
+                    for start, mean in history.downsample(
+                        attribute, window, bucket, now
+                    )
+                ],
+            }
+        return response
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history,
+        schema=SERVICE_GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    for air_purifier_service in SERVICE_TO_METHOD:
+        schema = SERVICE_TO_METHOD[air_purifier_service].get(
+            "schema", AIRPURIFIER_SERVICE_SCHEMA
+        )
+        hass.services.async_register(
+            DOMAIN, air_purifier_service, async_service_handler, schema=schema
+        )
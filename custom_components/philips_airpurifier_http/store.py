@@ -0,0 +1,86 @@
+"""Persistent per-device data for philips_airpurifier_http."""
+
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_PHILIPS_STORE, DOMAIN
+
+STORAGE_VERSION = 1
+STORAGE_KEY = DOMAIN
+SAVE_DELAY = 10
+# Snapshots change on most polls, they are kept apart and saved periodically
+SNAPSHOTS_STORAGE_KEY = f"{DOMAIN}.snapshots"
+SNAPSHOTS_SAVE_INTERVAL = 5 * 60
+
+
+async def async_get_device_store(hass):
+    """Return the shared device store, loading it on first use."""
+    if DATA_PHILIPS_STORE not in hass.data:
+        store = PhilipsDeviceStore(hass)
+        hass.data[DATA_PHILIPS_STORE] = hass.async_create_task(store.async_load())
+
+    return await hass.data[DATA_PHILIPS_STORE]
+
+
+class PhilipsDeviceStore:
+    """Keep device data across Home Assistant restarts.
+
+    Last known snapshots live in a store of their own. They are saved at
+    most every SNAPSHOTS_SAVE_INTERVAL seconds and on shutdown, so their
+    frequent changes never hold back saving the other device data.
+    """
+
+    def __init__(self, hass):
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._snapshots_store = Store(hass, STORAGE_VERSION, SNAPSHOTS_STORAGE_KEY)
+        self._devices = {}
+        self._snapshots = {}
+        self._snapshots_save_pending = False
+
+    async def async_load(self):
+        """Load stored data and return the store."""
+        data = await self._store.async_load()
+        if data is not None:
+            self._devices = data.get("devices", {})
+        snapshots = await self._snapshots_store.async_load()
+        if snapshots is not None:
+            self._snapshots = snapshots.get("snapshots", {})
+        return self
+
+    def get(self, host, key, default=None):
+        """Return a stored value for a device."""
+        return self._devices.get(host, {}).get(key, default)
+
+    def set(self, host, key, value):
+        """Store a value for a device."""
+        device = self._devices.setdefault(host, {})
+        if device.get(key) == value:
+            return
+        device[key] = value
+        self._schedule_save()
+
+    def remove(self, host, key):
+        """Remove a stored value for a device."""
+        if self._devices.get(host, {}).pop(key, None) is not None:
+            self._schedule_save()
+
+    def get_snapshot(self, host):
+        """Return the last known snapshot values of a device."""
+        return self._snapshots.get(host)
+
+    def set_snapshot(self, host, values):
+        """Store the last known snapshot values of a device."""
+        self._snapshots[host] = values
+        # Delayed saves are pushed back by every new call, only schedule one
+        # when none is pending so snapshots are saved at a steady pace
+        if not self._snapshots_save_pending:
+            self._snapshots_save_pending = True
+            self._snapshots_store.async_delay_save(
+                self._snapshots_data, SNAPSHOTS_SAVE_INTERVAL
+            )
+
+    def _snapshots_data(self):
+        self._snapshots_save_pending = False
+        return {"snapshots": self._snapshots}
+
+    def _schedule_save(self):
+        self._store.async_delay_save(lambda: {"devices": self._devices}, SAVE_DELAY)
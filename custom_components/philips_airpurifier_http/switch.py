@@ -0,0 +1,79 @@
+"""Switches for Philips Air Purifiers and Humidifiers."""
+
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
+from homeassistant.const import CONF_NAME, EntityCategory
+
+from .const import (
+    ATTR_CHILD_LOCK,
+    ATTR_DISPLAY_LIGHT,
+    DOMAIN,
+    PHILIPS_CHILD_LOCK,
+    PHILIPS_DISPLAY_LIGHT,
+)
+from .entity import PhilipsAirPurifierEntity
+from .model_config import DEVICE_CONFIG_ATTRIBUTES
+
+
+@dataclass(frozen=True, kw_only=True)
+class PhilipsSwitchEntityDescription(SwitchEntityDescription):
+    """Describe a Philips device switch."""
+
+    philips_key: str
+    on_value: Any = True
+    off_value: Any = False
+
+
+SWITCH_TYPES = (
+    PhilipsSwitchEntityDescription(
+        key=ATTR_CHILD_LOCK,
+        philips_key=PHILIPS_CHILD_LOCK,
+        name="Child lock",
+        icon="mdi:lock",
+        entity_category=EntityCategory.CONFIG,
+    ),
+    PhilipsSwitchEntityDescription(
+        key=ATTR_DISPLAY_LIGHT,
+        philips_key=PHILIPS_DISPLAY_LIGHT,
+        name="Display light",
+        icon="mdi:lightbulb",
+        entity_category=EntityCategory.CONFIG,
+        on_value="1",
+        off_value="0",
+    ),
+)
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up switches for a configured purifier."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    # Only the values the device model supports
+    attributes = coordinator.model_config[DEVICE_CONFIG_ATTRIBUTES]
+    async_add_entities(
+        PhilipsAirPurifierSwitch(coordinator, entry.data[CONF_NAME], description)
+        for description in SWITCH_TYPES
+        if description.key in attributes
+    )
+
+
+class PhilipsAirPurifierSwitch(PhilipsAirPurifierEntity, SwitchEntity):
+    """A device setting that can be turned on or off."""
+
+    @property
+    def is_on(self):
+        """Return True when the setting is on."""
+        return bool(self._value)
+
+    async def async_turn_on(self, **kwargs):
+        """Turn the setting on."""
+        await self._async_set_values(
+            {self.entity_description.philips_key: self.entity_description.on_value}
+        )
+
+    async def async_turn_off(self, **kwargs):
+        """Turn the setting off."""
+        await self._async_set_values(
+            {self.entity_description.philips_key: self.entity_description.off_value}
+        )
@@ -0,0 +1,17 @@
+"""Bidirectional maps between Philips API values and readable values."""
+
+
+class ValueMap(dict):
+    """Map Philips API values to readable values and back.
+
+    The reverse lookup is built once on creation, so maps must not be
+    modified afterwards.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._inverse = {value: key for key, value in self.items()}
+
+    def encode(self, value):
+        """Return the Philips API value for a readable value, or None."""
+        return self._inverse.get(value)
@@ -0,0 +1,72 @@
+"""Coalescing of writes to a philips_airpurifier_http device."""
+
+import asyncio
+
+from homeassistant.exceptions import HomeAssistantError
+
+
+class WriteQueue:
+    """Merge writes issued close together into a single set_values request.
+
+    Values queued within ``delay`` seconds of the first pending write are sent
+    together, later values overriding earlier ones for the same key. Every
+    caller gets the device response to the merged request.
+    """
+
+    def __init__(self, hass, write, delay):
+        self._hass = hass
+        self._write = write
+        self._delay = delay
+        self._pending = {}
+        self._waiters = []
+        self._flush_handle = None
+        self._write_lock = asyncio.Lock()
+
+    async def async_set_values(self, values):
+        """Queue values and wait until they were sent."""
+        self._pending.update(values)
+        waiter = self._hass.loop.create_future()
+        self._waiters.append(waiter)
+
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(self._delay, self._flush)
+
+        return await waiter
+
+    def cancel(self):
+        """Drop pending values, cancelling the callers waiting for them."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending = {}
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            waiter.cancel()
+
+    def _flush(self):
+        self._flush_handle = None
+        values, self._pending = self._pending, {}
+        waiters, self._waiters = self._waiters, []
+        self._hass.async_create_task(self._async_write(values, waiters))
+
+    async def _async_write(self, values, waiters):
+        try:
+            # Keep batches in order so the latest values always land last
+            async with self._write_lock:
+                result = await self._write(values)
+        except asyncio.CancelledError:
+            # Callers would otherwise wait forever
+            self._fail(waiters, HomeAssistantError("Write was cancelled"))
+            raise
+        except Exception as exc:  # pylint: disable=broad-except
+            self._fail(waiters, exc)
+        else:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(result)
+
+    @staticmethod
+    def _fail(waiters, exc):
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_exception(exc)
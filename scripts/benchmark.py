@@ -0,0 +1,279 @@
+"""End-to-end benchmark of philips_airpurifier_http against emulated devices.
+
+Boots Home Assistant from a temporary config directory with one fan per
+emulated device, then measures fan updates and domain service calls:
+
+    python scripts/benchmark.py --devices 50 --cycles 20 --latency 0.05
+
+Reported: update and service latency percentiles, device requests per
+update cycle and service call, executor threads and memory allocated per
+entity.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from homeassistant import bootstrap
+from homeassistant.runner import RuntimeConfig
+
+from emulator import add_device_arguments, async_start_devices, device_options
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# pylint: disable=wrong-import-position
+from custom_components.philips_airpurifier_http.const import (  # noqa: E402
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+    DOMAIN,
+    SERVICE_SET_LIGHT_BRIGHTNESS,
+)
+from custom_components.philips_airpurifier_http.registry import (  # noqa: E402
+    get_fan_registry,
+)
+
+# Name prefix of the benchmarked entities
+NAME = "Bench"
+# Home Assistant runs blocking work in threads with this name prefix
+EXECUTOR_THREAD_PREFIX = "SyncWorker"
+
+CONFIG = """
+logger:
+  default: warning
+
+philips_airpurifier_http:
+  max_concurrent_requests: {max_concurrent_requests}
+  max_requests_per_second: {max_requests_per_second}
+
+fan:
+{platforms}
+"""
+
+PLATFORM = """  - platform: philips_airpurifier_http
+    host: "{host}"
+    name: "{name}"
+    status_interval: "01:00:00"
+    write_delay: {write_delay}
+"""
+
+
+class ThreadSampler:
+    """Record the peak number of threads while the benchmark runs."""
+
+    def __init__(self, interval=0.01):
+        self._interval = interval
+        self.peak_threads = 0
+        self.peak_executor_threads = 0
+
+    def sample(self):
+        threads = threading.enumerate()
+        executor = [t for t in threads if t.name.startswith(EXECUTOR_THREAD_PREFIX)]
+        self.peak_threads = max(self.peak_threads, len(threads))
+        self.peak_executor_threads = max(self.peak_executor_threads, len(executor))
+
+    async def async_run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self._interval)
+
+
+def percentiles(samples):
+    """Return p50, p95 and p99 of samples in milliseconds."""
+    if len(samples) < 2:
+        samples = samples * 2 or [0.0, 0.0]
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50": round(quantiles[49] * 1000, 2),
+        "p95": round(quantiles[94] * 1000, 2),
+        "p99": round(quantiles[98] * 1000, 2),
+        "max": round(max(samples) * 1000, 2),
+    }
+
+
+async def async_setup_hass(config_dir, devices, args):
+    """Boot Home Assistant with a fan for each emulated device."""
+    os.symlink(ROOT / "custom_components", Path(config_dir) / "custom_components")
+    platforms = "".join(
+        PLATFORM.format(
+            host=device.host, name=f"{NAME} {i}", write_delay=args.write_delay
+        )
+        for i, device in enumerate(devices)
+    )
+    (Path(config_dir) / "configuration.yaml").write_text(
+        CONFIG.format(
+            platforms=platforms,
+            max_concurrent_requests=args.max_concurrent_requests,
+            max_requests_per_second=args.max_requests_per_second,
+        )
+    )
+
+    hass = await bootstrap.async_setup_hass(
+        RuntimeConfig(config_dir=config_dir, skip_pip=True)
+    )
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    # Home Assistant keeps running without a failed integration, don't
+    # benchmark an empty fleet
+    fans = len(get_fan_registry(hass))
+    if DOMAIN not in hass.config.components or fans != len(devices):
+        await hass.async_stop()
+        raise RuntimeError(
+            f"{DOMAIN} set up {fans} of {len(devices)} fans, see the log above"
+        )
+    return hass
+
+
+async def async_update_fans(fans):
+    """Update every fan once and return the latency of each update."""
+
+    async def async_update(fan):
+        # Like fan.async_update, without the refresh cooldown, so every
+        # cycle reads the device status
+        start = time.perf_counter()
+        await fan.coordinator.async_refresh_status()
+        return time.perf_counter() - start
+
+    return await asyncio.gather(*(async_update(fan) for fan in fans))
+
+
+async def async_call_service(hass, entity_ids, level):
+    """Set the light brightness of all fans through the domain service."""
+    start = time.perf_counter()
+    try:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_LIGHT_BRIGHTNESS,
+            {"entity_id": entity_ids, "level": level},
+            blocking=True,
+        )
+    except Exception:  # pylint: disable=broad-except
+        return time.perf_counter() - start, False
+    return time.perf_counter() - start, True
+
+
+def component_memory(snapshot):
+    """Return the bytes currently allocated by the integration's code."""
+    component = os.path.join("*", "custom_components", DOMAIN, "*")
+    traces = snapshot.filter_traces([tracemalloc.Filter(True, component)])
+    return sum(stat.size for stat in traces.statistics("filename"))
+
+
+async def async_benchmark(args):
+    devices = await async_start_devices(
+        args.devices, args.model, **device_options(args)
+    )
+    sampler = ThreadSampler()
+    sampler_task = asyncio.create_task(sampler.async_run())
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        tracemalloc.start()
+        hass = await async_setup_hass(config_dir, devices, args)
+        try:
+            fans = list(get_fan_registry(hass))
+            entity_ids = [
+                state.entity_id
+                for state in hass.states.async_all()
+                if state.object_id.startswith(NAME.lower())
+            ]
+
+            update_latencies = []
+            requests_per_cycle = []
+            for _ in range(args.cycles):
+                for device in devices:
+                    device.requests.clear()
+                update_latencies.extend(await async_update_fans(fans))
+                requests_per_cycle.append(
+                    sum(sum(device.requests.values()) for device in devices)
+                )
+
+            memory = component_memory(tracemalloc.take_snapshot())
+            tracemalloc.stop()
+
+            service_latencies = []
+            service_failures = 0
+            requests_per_service_call = []
+            fan_ids = [fan.entity_id for fan in fans]
+            for call in range(args.service_calls):
+                for device in devices:
+                    device.requests.clear()
+                latency, success = await async_call_service(
+                    hass, fan_ids, 100 if call % 2 else 50
+                )
+                service_latencies.append(latency)
+                service_failures += not success
+                requests_per_service_call.append(
+                    sum(sum(device.requests.values()) for device in devices)
+                )
+        finally:
+            await hass.async_stop()
+            sampler_task.cancel()
+            await asyncio.gather(*(device.async_stop() for device in devices))
+
+    return {
+        "devices": len(devices),
+        "fans": len(fans),
+        "entities": len(entity_ids),
+        "update_latency_ms": percentiles(update_latencies),
+        "requests_first_cycle": requests_per_cycle[0] if requests_per_cycle else 0,
+        "requests_per_cycle": (
+            statistics.mean(requests_per_cycle[1:])
+            if len(requests_per_cycle) > 1
+            else 0
+        ),
+        "service_latency_ms": percentiles(service_latencies),
+        "service_failures": service_failures,
+        "requests_per_service_call": (
+            statistics.mean(requests_per_service_call)
+            if requests_per_service_call
+            else 0
+        ),
+        "peak_threads": sampler.peak_threads,
+        "peak_executor_threads": sampler.peak_executor_threads,
+        "memory_per_entity_bytes": memory // max(len(entity_ids), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_device_arguments(parser)
+    parser.add_argument("--cycles", type=int, default=10, help="fan update cycles")
+    parser.add_argument(
+        "--service-calls", type=int, default=10, help="domain service calls"
+    )
+    parser.add_argument("--write-delay", type=float, default=0.0, help="seconds")
+    parser.add_argument(
+        "--max-concurrent-requests",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+        help="fleet-wide requests in flight",
+    )
+    parser.add_argument(
+        "--max-requests-per-second",
+        type=float,
+        default=DEFAULT_MAX_REQUESTS_PER_SECOND,
+        help="fleet-wide request rate",
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_benchmark(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for key, value in results.items():
+        print(f"{key:>26}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+"""Emulator of the Philips AirPurifier HTTP API.
+
+Serves emulated devices on localhost so the integration can be run and
+benchmarked without real hardware. Each device does the key exchange,
+serves encrypted status, filter and firmware endpoints and accepts
+encrypted writes, with configurable latency, jitter and failure injection.
+
+    python scripts/emulator.py --devices 3 --model AC2729_10
+
+With --ssdp the devices also answer SSDP searches like real purifiers, so
+they can be discovered by Home Assistant running on the same machine. Each
+device then listens on its own loopback address, on port 80 by default:
+
+    sudo python scripts/emulator.py --devices 3 --ssdp
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+import json
+import random
+import socket
+import struct
+import sys
+import uuid
+from pathlib import Path
+
+from aiohttp import web
+from Cryptodome.Cipher import AES
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# pylint: disable=wrong-import-position
+from custom_components.philips_airpurifier_http.http_client import (  # noqa: E402
+    DH_G,
+    DH_P,
+    PATH_FILTERS,
+    PATH_FIRMWARE,
+    PATH_SECURITY,
+    PATH_STATUS,
+    PhilipsAirDecryptError,
+    decrypt,
+    encrypt,
+)
+
+# Initial state reported by each emulated model
+PROFILES = {
+    "AC2729_10": {
+        "status": {
+            "pwr": "1",
+            "pm25": 8,
+            "rh": 45,
+            "rhset": 50,
+            "iaql": 2,
+            "temp": 22,
+            "func": "PH",
+            "mode": "P",
+            "om": "1",
+            "aqil": 100,
+            "uil": "1",
+            "ddp": "1",
+            "wl": 100,
+            "cl": False,
+            "dt": 0,
+            "dtrs": 0,
+        },
+        "filters": {"fltsts0": 287, "fltsts1": 4712, "fltsts2": 2400, "wicksts": 4712},
+    },
+    "AC2889_10": {
+        "status": {
+            "pwr": "1",
+            "pm25": 12,
+            "iaql": 3,
+            "mode": "P",
+            "om": "2",
+            "aqil": 100,
+            "uil": "1",
+            "ddp": "1",
+            "cl": False,
+            "dt": 0,
+            "dtrs": 0,
+        },
+        "filters": {"fltsts0": 310, "fltsts1": 4800, "fltsts2": 2400},
+    },
+    "AC3259_10": {
+        "status": {
+            "pwr": "1",
+            "pm25": 5,
+            "iaql": 1,
+            "mode": "A",
+            "om": "t",
+            "aqil": 75,
+            "uil": "1",
+            "ddp": "0",
+            "cl": False,
+            "dt": 0,
+            "dtrs": 0,
+        },
+        "filters": {"fltsts0": 150, "fltsts1": 3900, "fltsts2": 2100},
+    },
+}
+
+DEFAULT_PROFILE = "AC2729_10"
+
+# Seconds after switching to auto mode until the device picks a new speed
+AUTO_SPEED_DELAY = 3
+
+SSDP_ADDRESS = ("239.255.255.250", 1900)
+SSDP_DEVICE_TYPE = "urn:philips-com:device:DiProduct:1"
+SSDP_SEARCH_TARGETS = ("ssdp:all", "upnp:rootdevice", SSDP_DEVICE_TYPE)
+PATH_DESCRIPTION = "/description.xml"
+
+DESCRIPTION = """<?xml version="1.0"?>
+<root xmlns="urn:schemas-upnp-org:device-1-0">
+  <specVersion><major>1</major><minor>0</minor></specVersion>
+  <device>
+    <deviceType>{device_type}</deviceType>
+    <friendlyName>{name}</friendlyName>
+    <manufacturer>Royal Philips Electronics</manufacturer>
+    <modelName>{model}</modelName>
+    <UDN>uuid:{udn}</UDN>
+  </device>
+</root>
+"""
+
+SEARCH_RESPONSE = (
+    "HTTP/1.1 200 OK\r\n"
+    "CACHE-CONTROL: max-age=1800\r\n"
+    "EXT:\r\n"
+    "LOCATION: http://{host}{path}\r\n"
+    "SERVER: Linux UPnP/1.0 emulator/1.0\r\n"
+    "ST: {device_type}\r\n"
+    "USN: uuid:{udn}::{device_type}\r\n"
+    "\r\n"
+)
+
+
+class EmulatedDevice:
+    """A single emulated purifier listening on a local port."""
+
+    def __init__(
+        self,
+        model=DEFAULT_PROFILE,
+        latency=0.0,
+        jitter=0.0,
+        failure_rate=0.0,
+        drift=True,
+        mac_address=None,
+        name=None,
+        address="127.0.0.1",
+        port=0,
+    ):
+        profile = PROFILES[model]
+        self.model = model
+        self.name = name or f"Emulated {model}"
+        self.udn = str(uuid.uuid4())
+        self.status = dict(profile["status"])
+        self.filters = dict(profile["filters"])
+        self.mac_address = mac_address or "b0:f8:93:%02x:%02x:%02x" % tuple(
+            random.randbytes(3)
+        )
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.drift = drift
+        self.requests = Counter()
+        self.session_key = None
+        self.host = None
+        self._address = address
+        self._port = port
+        self._runner = None
+
+    def reboot(self):
+        """Forget the session key, like a device that was power cycled."""
+        self.session_key = None
+
+    async def async_start(self):
+        """Start serving on a free localhost port."""
+        app = web.Application()
+        app.router.add_put(PATH_SECURITY, self._handle_security)
+        app.router.add_get(PATH_STATUS, self._handle_status)
+        app.router.add_put(PATH_STATUS, self._handle_set_values)
+        app.router.add_get(PATH_FILTERS, self._handle_filters)
+        app.router.add_get(PATH_FIRMWARE, self._handle_firmware)
+        app.router.add_get(PATH_DESCRIPTION, self._handle_description)
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self._address, self._port))
+        port = sock.getsockname()[1]
+        self.host = self._address if port == 80 else f"{self._address}:{port}"
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock).start()
+
+    async def async_stop(self):
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _async_delay(self, path):
+        self.requests[path] += 1
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if random.random() < self.failure_rate:
+            raise web.HTTPServiceUnavailable()
+
+    def _encrypted(self, values):
+        if self.session_key is None:
+            return self._garbage()
+        return web.Response(text=encrypt(values, self.session_key).decode("ascii"))
+
+    @staticmethod
+    def _garbage():
+        # What a device answers when it doesn't share the client's key
+        return web.Response(text=encrypt({}, random.randbytes(16)).decode("ascii"))
+
+    def _read_sensors(self):
+        # Let the air quality drift so consecutive reads differ
+        if self.drift:
+            self.status["pm25"] = max(0, self.status["pm25"] + random.randint(-2, 2))
+        return self.status
+
+    def _pick_auto_speed(self):
+        if self.status.get("mode") == "P":
+            self.status["om"] = "1" if self.status["pm25"] < 12 else "2"
+
+    async def _handle_security(self, request):
+        await self._async_delay(request.path)
+        diffie = int((await request.json())["diffie"], 16)
+        secret = random.getrandbits(256)
+        shared = pow(diffie, secret, DH_P).to_bytes(128, byteorder="big")
+
+        self.session_key = random.randbytes(16)
+        cipher = AES.new(shared[:16], AES.MODE_CBC, bytes(16))
+        key = cipher.encrypt(self.session_key + random.randbytes(16))
+        return web.json_response(
+            {"hellman": format(pow(DH_G, secret, DH_P), "x"), "key": key.hex()}
+        )
+
+    async def _handle_status(self, request):
+        await self._async_delay(request.path)
+        return self._encrypted(self._read_sensors())
+
+    async def _handle_set_values(self, request):
+        await self._async_delay(request.path)
+        body = await request.text()
+        if self.session_key is None:
+            return self._garbage()
+        try:
+            values = decrypt(body, self.session_key)
+        except PhilipsAirDecryptError:
+            # Like real devices, ignore the write and answer with garbage, so
+            # the client renegotiates the key and sends the write again
+            return self._garbage()
+
+        self.status.update(values)
+        # Like real devices, auto mode settles on a speed a bit later
+        if values.get("mode") == "P":
+            asyncio.get_running_loop().call_later(
+                AUTO_SPEED_DELAY, self._pick_auto_speed
+            )
+        return self._encrypted(self.status)
+
+    async def _handle_filters(self, request):
+        await self._async_delay(request.path)
+        return self._encrypted(self.filters)
+
+    async def _handle_firmware(self, request):
+        await self._async_delay(request.path)
+        return self._encrypted(
+            {"name": self.model, "version": "1.0", "macaddress": self.mac_address}
+        )
+
+    async def _handle_description(self, request):
+        return web.Response(
+            text=DESCRIPTION.format(
+                device_type=SSDP_DEVICE_TYPE,
+                name=self.name,
+                model=self.model,
+                udn=self.udn,
+            ),
+            content_type="text/xml",
+        )
+
+
+class SsdpResponder(asyncio.DatagramProtocol):
+    """Answer SSDP searches on behalf of emulated devices."""
+
+    def __init__(self, devices):
+        self._devices = devices
+        self._transport = None
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def datagram_received(self, data, addr):
+        lines = data.decode("utf-8", "replace").split("\r\n")
+        if not lines[0].startswith("M-SEARCH"):
+            return
+
+        headers = dict(
+            (key.strip().upper(), value.strip())
+            for key, _, value in (line.partition(":") for line in lines[1:])
+        )
+        if headers.get("ST") not in SSDP_SEARCH_TARGETS:
+            return
+
+        for device in self._devices:
+            response = SEARCH_RESPONSE.format(
+                host=device.host,
+                path=PATH_DESCRIPTION,
+                device_type=SSDP_DEVICE_TYPE,
+                udn=device.udn,
+            )
+            self._transport.sendto(response.encode("utf-8"), addr)
+
+
+async def async_start_ssdp(devices):
+    """Answer SSDP searches for devices and return the transport."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("", SSDP_ADDRESS[1]))
+    membership = struct.pack(
+        "4s4s", socket.inet_aton(SSDP_ADDRESS[0]), socket.inet_aton("0.0.0.0")
+    )
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+
+    transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+        lambda: SsdpResponder(devices), sock=sock
+    )
+    return transport
+
+
+async def async_start_devices(count, model=DEFAULT_PROFILE, port=0, **kwargs):
+    """Start count emulated devices of a model and return them.
+
+    With a fixed port every device gets its own loopback address.
+    """
+    devices = [
+        EmulatedDevice(
+            model,
+            name=f"Emulated {model} {i}",
+            address=f"127.0.0.{i + 2}" if port else "127.0.0.1",
+            port=port,
+            **kwargs,
+        )
+        for i in range(count)
+    ]
+    await asyncio.gather(*(device.async_start() for device in devices))
+    return devices
+
+
+def add_device_arguments(parser):
+    """Add the options describing emulated devices to an argument parser."""
+    parser.add_argument("--devices", type=int, default=1, help="number of devices")
+    parser.add_argument("--model", choices=sorted(PROFILES), default=DEFAULT_PROFILE)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument(
+        "--failure-rate", type=float, default=0.0, help="fraction of failed requests"
+    )
+    parser.add_argument(
+        "--steady", action="store_true", help="keep sensor readings constant"
+    )
+
+
+def device_options(args):
+    """Return the EmulatedDevice options selected on the command line."""
+    return {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "failure_rate": args.failure_rate,
+        "drift": not args.steady,
+    }
+
+
+async def async_main(args):
+    port = args.port if args.port is not None else 80 if args.ssdp else 0
+    devices = await async_start_devices(
+        args.devices, args.model, port, **device_options(args)
+    )
+    ssdp = await async_start_ssdp(devices) if args.ssdp else None
+    print(
+        json.dumps([{"host": device.host, "model": device.model} for device in devices])
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        if ssdp is not None:
+            ssdp.close()
+        await asyncio.gather(*(device.async_stop() for device in devices))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_device_arguments(parser)
+    parser.add_argument("--ssdp", action="store_true", help="answer SSDP searches")
+    parser.add_argument("--port", type=int, help="port of every device")
+    try:
+        asyncio.run(async_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
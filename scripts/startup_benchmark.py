@@ -0,0 +1,176 @@
+"""Startup cost of philips_airpurifier_http against emulated devices.
+
+Measures how long importing the integration takes in a fresh interpreter,
+whether that pulls in the crypto stack, and how long Home Assistant takes to
+create the purifiers' entities. Home Assistant is booted twice from the
+same config directory: a cold start importing the YAML purifiers, then a
+warm start from the saved config entries and last known states.
+
+    python scripts/startup_benchmark.py --devices 20 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from homeassistant import bootstrap
+from homeassistant.runner import RuntimeConfig
+from homeassistant.util import dt as dt_util
+
+from emulator import add_device_arguments, async_start_devices, device_options
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# pylint: disable=wrong-import-position
+from custom_components.philips_airpurifier_http.const import (  # noqa: E402
+    ATTR_STALE,
+    DOMAIN,
+)
+
+# Name prefix of the benchmarked fans
+NAME = "Startup"
+
+CONFIG = """
+logger:
+  default: warning
+
+fan:
+{platforms}
+"""
+
+PLATFORM = """  - platform: philips_airpurifier_http
+    host: "{host}"
+    name: "{name} {index}"
+    status_interval: "{status_interval}"
+"""
+
+# Run in a fresh interpreter so nothing is imported yet
+IMPORT_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import custom_components.philips_airpurifier_http
+import custom_components.philips_airpurifier_http.config_flow
+import custom_components.philips_airpurifier_http.fan
+import custom_components.philips_airpurifier_http.sensor
+print(json.dumps({{
+    "import_ms": round((time.perf_counter() - start) * 1000, 1),
+    "crypto_imported": "Cryptodome" in sys.modules,
+}}))
+"""
+
+
+def measure_import():
+    """Return the import time of the integration in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT.format(root=str(ROOT))],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def fan_states(hass):
+    """Return the states of the benchmarked fans."""
+    return [
+        state
+        for state in hass.states.async_all("fan")
+        if state.object_id.startswith(NAME.lower())
+    ]
+
+
+async def async_boot(config_dir, count, timeout):
+    """Boot Home Assistant and time how long its fans take to appear.
+
+    Returns milliseconds until the first and the last fan were created, and
+    how many fans started from a restored, stale state.
+    """
+    start = dt_util.utcnow()
+    hass = await bootstrap.async_setup_hass(
+        RuntimeConfig(config_dir=config_dir, skip_pip=True)
+    )
+    await hass.async_start()
+
+    deadline = time.monotonic() + timeout
+    while len(fan_states(hass)) < count and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+
+    if DOMAIN not in hass.config.components:
+        await hass.async_stop()
+        raise RuntimeError(f"{DOMAIN} failed to set up, see the log above")
+
+    states = fan_states(hass)
+    created = sorted(
+        (state.last_changed - start).total_seconds() * 1000 for state in states
+    )
+    result = {
+        "fans": len(states),
+        "first_entity_ms": round(created[0], 1) if created else None,
+        "all_entities_ms": round(created[-1], 1) if created else None,
+        "stale_fans": sum(bool(state.attributes.get(ATTR_STALE)) for state in states),
+    }
+    await hass.async_stop()
+    return result
+
+
+async def async_benchmark(args):
+    devices = await async_start_devices(
+        args.devices, args.model, **device_options(args)
+    )
+    try:
+        with tempfile.TemporaryDirectory() as config_dir:
+            os.symlink(
+                ROOT / "custom_components", Path(config_dir) / "custom_components"
+            )
+            platforms = "".join(
+                PLATFORM.format(
+                    host=device.host,
+                    name=NAME,
+                    index=index,
+                    status_interval=args.status_interval,
+                )
+                for index, device in enumerate(devices)
+            )
+            (Path(config_dir) / "configuration.yaml").write_text(
+                CONFIG.format(platforms=platforms)
+            )
+
+            cold = await async_boot(config_dir, len(devices), args.timeout)
+            warm = await async_boot(config_dir, len(devices), args.timeout)
+    finally:
+        await asyncio.gather(*(device.async_stop() for device in devices))
+
+    return {"devices": len(devices), **measure_import(), "cold": cold, "warm": warm}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_device_arguments(parser)
+    parser.add_argument(
+        "--status-interval", default="00:00:30", help="status_interval of the fans"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=60, help="seconds to wait for all fans"
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(async_benchmark(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for key, value in results.items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Tests for philips_airpurifier_http."""
@@ -0,0 +1,66 @@
+"""Fixtures for philips_airpurifier_http tests."""
+
+from homeassistant.const import CONF_HOST, CONF_NAME
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.philips_airpurifier_http.const import DOMAIN
+from custom_components.philips_airpurifier_http.http_client import (
+    AsyncHTTPAirClient,
+    async_import_crypto,
+)
+from emulator import EmulatedDevice
+
+NAME = "Living room"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components."""
+    yield
+
+
+@pytest.fixture
+async def device(socket_enabled):
+    """Return an emulated AC2729 purifier with steady readings."""
+    device = EmulatedDevice(drift=False)
+    await device.async_start()
+    yield device
+    await device.async_stop()
+
+
+@pytest.fixture
+async def client(hass, device):
+    """Return a client talking to the emulated purifier."""
+    await async_import_crypto(hass)
+    return AsyncHTTPAirClient(device.host, async_get_clientsession(hass))
+
+
+@pytest.fixture
+def config_entry(hass, device):
+    """Return a config entry of the emulated purifier."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=NAME,
+        data={CONF_HOST: device.host, CONF_NAME: NAME},
+        unique_id=device.mac_address,
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def coordinator(hass, config_entry):
+    """Set up the emulated purifier and return its coordinator."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    return hass.data[DOMAIN][config_entry.entry_id]
+
+
+@pytest.fixture
+async def polled_coordinator(hass, coordinator):
+    """Set up the emulated purifier and read its state once."""
+    await coordinator.async_refresh_status()
+    await hass.async_block_till_done()
+    return coordinator
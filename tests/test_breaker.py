@@ -0,0 +1,94 @@
+"""Tests for the circuit breaker."""
+
+import pytest
+
+from custom_components.philips_airpurifier_http import breaker as breaker_module
+from custom_components.philips_airpurifier_http.breaker import (
+    FAILURE_THRESHOLD,
+    RESET_TIMEOUT,
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the monotonic clock of the breaker with a settable one."""
+    now = [1000.0]
+    monkeypatch.setattr(breaker_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def open_breaker(breaker):
+    for _ in range(FAILURE_THRESHOLD):
+        assert breaker.try_acquire()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker()
+    for _ in range(FAILURE_THRESHOLD - 1):
+        assert not breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+
+    assert breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.try_acquire()
+    assert breaker.seconds_until_probe() == RESET_TIMEOUT
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker()
+    for _ in range(FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    assert not breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+
+
+def test_half_open_allows_a_single_probe(clock):
+    breaker = CircuitBreaker()
+    open_breaker(breaker)
+    clock[0] += RESET_TIMEOUT
+
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.try_acquire()
+    assert not breaker.try_acquire()
+
+    assert breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.try_acquire()
+
+
+def test_failed_probe_doubles_the_timeout(clock):
+    breaker = CircuitBreaker()
+    open_breaker(breaker)
+    clock[0] += RESET_TIMEOUT
+    assert breaker.try_acquire()
+
+    assert not breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.seconds_until_probe() == 2 * RESET_TIMEOUT
+
+
+def test_timeout_is_capped(clock):
+    breaker = CircuitBreaker(reset_timeout=10, max_reset_timeout=25)
+    open_breaker(breaker)
+    for _ in range(3):
+        clock[0] += breaker.seconds_until_probe()
+        assert breaker.try_acquire()
+        breaker.record_failure()
+    assert breaker.seconds_until_probe() == 25
+
+
+def test_released_probe_can_be_retried(clock):
+    breaker = CircuitBreaker()
+    open_breaker(breaker)
+    clock[0] += RESET_TIMEOUT
+    assert breaker.try_acquire()
+
+    breaker.release()
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.try_acquire()
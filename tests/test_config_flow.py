@@ -0,0 +1,238 @@
+"""Tests for the config and options flows."""
+
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_HOST, CONF_NAME
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import issue_registry as ir
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.philips_airpurifier_http.const import (
+    ATTR_MODEL,
+    ATTR_SESSION_KEY,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_FILTERS_INTERVAL,
+    CONF_FIRMWARE_INTERVAL,
+    CONF_STATUS_INTERVAL,
+    CONF_WRITE_DELAY,
+    DOMAIN,
+)
+from custom_components.philips_airpurifier_http.store import async_get_device_store
+
+from .conftest import NAME
+
+# A port nothing listens on
+UNREACHABLE_HOST = "127.0.0.1:9"
+
+
+def import_data(host, name=NAME, status_interval=60):
+    """Return the YAML fan platform config of a purifier."""
+    return {
+        CONF_HOST: host,
+        CONF_NAME: name,
+        CONF_STATUS_INTERVAL: timedelta(seconds=status_interval),
+        CONF_FILTERS_INTERVAL: timedelta(minutes=30),
+        CONF_FIRMWARE_INTERVAL: timedelta(days=1),
+        CONF_WRITE_DELAY: 0.1,
+        CONF_DIAGNOSTIC_SENSORS: False,
+    }
+
+
+def discovery_info(host, name="Bedroom"):
+    """Return an SSDP announcement of a purifier."""
+    return SimpleNamespace(
+        ssdp_location=f"http://{host}/description.xml",
+        upnp={"friendlyName": name},
+    )
+
+
+async def test_user_step_reads_the_device(hass, device):
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] is FlowResultType.FORM
+
+    with patch(
+        "custom_components.philips_airpurifier_http.async_setup_entry",
+        return_value=True,
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_HOST: device.host, CONF_NAME: NAME}
+        )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == NAME
+    assert result["data"] == {CONF_HOST: device.host, CONF_NAME: NAME}
+    assert result["result"].unique_id == device.mac_address
+
+    # Kept for setting up the entry without asking the device again
+    store = await async_get_device_store(hass)
+    assert store.get(device.host, ATTR_MODEL) == device.model
+    assert store.get(device.host, ATTR_SESSION_KEY) == device.session_key.hex()
+
+
+async def test_user_step_unreachable_device(hass, socket_enabled):
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": config_entries.SOURCE_USER},
+        data={CONF_HOST: UNREACHABLE_HOST, CONF_NAME: NAME},
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "cannot_connect"}
+
+
+async def test_user_step_configured_host(hass, config_entry, device):
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": config_entries.SOURCE_USER},
+        data={CONF_HOST: device.host, CONF_NAME: NAME},
+    )
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+
+async def test_ssdp_discovery_is_confirmed(hass):
+    firmware = {"name": "AC2729_10", "macaddress": "b0:f8:93:00:00:01"}
+    with patch(
+        "custom_components.philips_airpurifier_http.config_flow.async_read_device",
+        return_value=firmware,
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_SSDP},
+            data=discovery_info("192.168.1.2"),
+        )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "discovery_confirm"
+
+    with patch(
+        "custom_components.philips_airpurifier_http.async_setup_entry",
+        return_value=True,
+    ):
+        result = await hass.config_entries.flow.async_configure(result["flow_id"], {})
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_HOST: "192.168.1.2", CONF_NAME: "Bedroom"}
+    assert result["result"].unique_id == firmware["macaddress"]
+
+
+async def test_ssdp_discovery_updates_a_moved_device(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "192.168.1.2", CONF_NAME: NAME},
+        unique_id="b0:f8:93:00:00:01",
+    )
+    entry.add_to_hass(hass)
+
+    firmware = {"name": "AC2729_10", "macaddress": "b0:f8:93:00:00:01"}
+    with patch(
+        "custom_components.philips_airpurifier_http.config_flow.async_read_device",
+        return_value=firmware,
+    ), patch(
+        "custom_components.philips_airpurifier_http.async_setup_entry",
+        return_value=True,
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_SSDP},
+            data=discovery_info("192.168.1.3"),
+        )
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    assert entry.data[CONF_HOST] == "192.168.1.3"
+
+
+async def test_import_creates_an_entry_and_an_issue(hass, device):
+    with patch(
+        "custom_components.philips_airpurifier_http.async_setup_entry",
+        return_value=True,
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_IMPORT},
+            data=import_data(device.host),
+        )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["result"].unique_id == device.mac_address
+    assert result["options"][CONF_STATUS_INTERVAL] == 60
+    assert ir.async_get(hass).async_get_issue(DOMAIN, "deprecated_yaml")
+
+
+async def test_import_of_an_unreachable_device(hass, socket_enabled):
+    with patch(
+        "custom_components.philips_airpurifier_http.async_setup_entry",
+        return_value=True,
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_IMPORT},
+            data=import_data(UNREACHABLE_HOST),
+        )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["result"].unique_id is None
+
+
+async def test_import_updates_the_imported_entry(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        source=config_entries.SOURCE_IMPORT,
+        data={CONF_HOST: "192.168.1.2", CONF_NAME: NAME},
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": config_entries.SOURCE_IMPORT},
+        data=import_data("192.168.1.2", "Kitchen", 90),
+    )
+
+    assert result["type"] is FlowResultType.ABORT
+    assert entry.title == "Kitchen"
+    assert entry.data[CONF_NAME] == "Kitchen"
+    assert entry.options[CONF_STATUS_INTERVAL] == 90
+
+
+async def test_import_leaves_entries_set_up_from_the_ui(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_HOST: "192.168.1.2", CONF_NAME: NAME}
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": config_entries.SOURCE_IMPORT},
+        data=import_data("192.168.1.2", "Kitchen"),
+    )
+
+    assert result["type"] is FlowResultType.ABORT
+    assert entry.data[CONF_NAME] == NAME
+    assert not entry.options
+
+
+async def test_options_flow(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_HOST: "192.168.1.2", CONF_NAME: NAME}
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+
+    with patch(
+        "custom_components.philips_airpurifier_http.async_setup_entry",
+        return_value=True,
+    ):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {CONF_STATUS_INTERVAL: 10, CONF_WRITE_DELAY: 0}
+        )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_STATUS_INTERVAL] == 10
+    assert entry.options[CONF_WRITE_DELAY] == 0
+    assert entry.options[CONF_FILTERS_INTERVAL] == 1800
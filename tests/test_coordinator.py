@@ -0,0 +1,232 @@
+"""Tests for the shared polling coordinator, against an emulated purifier."""
+
+import asyncio
+from datetime import timedelta
+
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.philips_airpurifier_http.breaker import (
+    FAILURE_THRESHOLD,
+    RESET_TIMEOUT,
+)
+from custom_components.philips_airpurifier_http.const import (
+    ATTR_FAN_SPEED,
+    ATTR_MODEL,
+    ATTR_PM25,
+    ATTR_POWER,
+    ATTR_PRE_FILTER,
+    ATTR_SESSION_KEY,
+)
+from custom_components.philips_airpurifier_http.coordinator import (
+    MIN_UPDATE_INTERVAL,
+    PhilipsAirPurifierCoordinator,
+)
+from custom_components.philips_airpurifier_http.http_client import (
+    PATH_FILTERS,
+    PATH_FIRMWARE,
+    PATH_SECURITY,
+    PATH_STATUS,
+)
+from custom_components.philips_airpurifier_http.scheduler import (
+    BURST_INTERVAL,
+    ENDPOINT_FILTERS,
+    ENDPOINT_FIRMWARE,
+    ENDPOINT_STATUS,
+    PollScheduler,
+)
+from custom_components.philips_airpurifier_http.store import async_get_device_store
+
+STATUS_INTERVAL = 30
+
+
+@pytest.fixture
+async def make_coordinator(hass, client):
+    """Return a factory of coordinators polling every endpoint right away."""
+    store = await async_get_device_store(hass)
+    coordinators = []
+
+    async def make():
+        scheduler = PollScheduler(
+            {
+                ENDPOINT_STATUS: STATUS_INTERVAL,
+                ENDPOINT_FILTERS: 1800,
+                ENDPOINT_FIRMWARE: 86400,
+            },
+            jitter=0,
+            start_offset=0,
+        )
+        coordinator = PhilipsAirPurifierCoordinator(
+            hass, client, store, scheduler, 0, "device"
+        )
+        await coordinator.async_load_model()
+        coordinators.append(coordinator)
+        return coordinator
+
+    yield make
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+
+
+@pytest.fixture
+async def coordinator(make_coordinator):
+    """Return a coordinator that read every endpoint once."""
+    coordinator = await make_coordinator()
+    await coordinator.async_refresh()
+    return coordinator
+
+
+async def test_first_update_reads_every_endpoint(coordinator, device):
+    assert coordinator.last_update_success
+    assert coordinator.data[ATTR_PM25] == device.status["pm25"]
+    assert coordinator.data[ATTR_PRE_FILTER] == device.filters["fltsts0"]
+    assert coordinator.model == device.model
+    assert coordinator.mac_address == device.mac_address
+    assert device.requests == {
+        PATH_SECURITY: 1,
+        PATH_STATUS: 1,
+        PATH_FILTERS: 1,
+        PATH_FIRMWARE: 1,
+    }
+
+
+async def test_later_updates_only_read_the_status(coordinator, device):
+    await coordinator.async_refresh_status()
+
+    assert device.requests[PATH_STATUS] == 2
+    assert device.requests[PATH_FILTERS] == 1
+    assert device.requests[PATH_FIRMWARE] == 1
+    assert coordinator.update_interval.total_seconds() == pytest.approx(
+        STATUS_INTERVAL, abs=1
+    )
+
+
+async def test_model_is_stored(hass, coordinator, make_coordinator, device):
+    store = await async_get_device_store(hass)
+    assert store.get(device.host, ATTR_MODEL) == device.model
+    assert store.get(device.host, ATTR_SESSION_KEY) == device.session_key.hex()
+
+    restarted = await make_coordinator()
+    assert restarted.model == device.model
+    await restarted.async_refresh()
+    assert device.requests[PATH_FIRMWARE] == 1
+
+
+async def test_rekey_rereads_the_model(coordinator, device):
+    device.reboot()
+    await coordinator.async_refresh_status()
+    assert coordinator.model is None
+    # The firmware is due right away, but updates never run back to back
+    assert coordinator.update_interval == timedelta(seconds=MIN_UPDATE_INTERVAL)
+
+    await coordinator.async_refresh()
+    assert coordinator.model == device.model
+    assert device.requests[PATH_FIRMWARE] == 2
+
+
+async def test_unchanged_updates_do_not_notify_entities(coordinator, device):
+    updates = []
+    unsubscribe = coordinator.async_add_listener(lambda: updates.append(True))
+
+    await coordinator.async_refresh_status()
+    assert not updates
+
+    device.status["pm25"] = 30
+    await coordinator.async_refresh_status()
+    assert updates == [True]
+    unsubscribe()
+
+
+async def test_write_applies_the_answered_status(coordinator, device):
+    await coordinator.async_set_values({"om": "3"})
+
+    assert coordinator.data[ATTR_FAN_SPEED] == "Speed 3"
+    # The first poll and the write, no poll after it
+    assert device.requests[PATH_STATUS] == 2
+    # Our own write is no reason to poll in bursts
+    assert coordinator.update_interval.total_seconds() == pytest.approx(
+        STATUS_INTERVAL, abs=1
+    )
+
+
+async def test_changes_from_the_device_are_followed_closely(coordinator, device):
+    device.status["om"] = "3"
+    await coordinator.async_refresh_status()
+    assert coordinator.update_interval.total_seconds() <= BURST_INTERVAL
+
+
+async def test_unsupported_values_are_rejected(coordinator, device):
+    with pytest.raises(HomeAssistantError, match="bogus"):
+        await coordinator.async_set_values({"bogus": 1})
+    assert device.requests[PATH_STATUS] == 1
+
+
+async def test_failed_write_refreshes_soon(coordinator, device):
+    device.failure_rate = 1.0
+    with pytest.raises(Exception):
+        await coordinator.async_set_values({"pwr": "0"})
+    assert coordinator.update_interval == timedelta(seconds=MIN_UPDATE_INTERVAL)
+
+
+async def test_status_errors_fail_the_update(coordinator, device):
+    device.failure_rate = 1.0
+    await coordinator.async_refresh_status()
+
+    assert not coordinator.last_update_success
+    # The last known state is kept
+    assert coordinator.data[ATTR_PM25] == device.status["pm25"]
+
+
+async def test_writes_in_quick_succession_are_merged(coordinator, device):
+    writes = device.requests[PATH_STATUS]
+
+    await asyncio.gather(
+        coordinator.async_set_values({"cl": True}),
+        coordinator.async_set_values({"om": "2"}),
+    )
+
+    assert device.status["cl"] is True
+    assert device.status["om"] == "2"
+    # A single write, its response is the new status
+    assert device.requests[PATH_STATUS] == writes + 1
+    assert coordinator.data[ATTR_FAN_SPEED] == "Speed 2"
+
+
+async def test_incomplete_write_responses_refresh_the_status(coordinator, device):
+    del device.status["pwr"]
+    reads = device.requests[PATH_STATUS]
+
+    await coordinator.async_set_values({"cl": True})
+
+    assert device.requests[PATH_STATUS] == reads + 2
+
+
+async def test_unreachable_devices_are_left_alone_until_the_probe(coordinator, device):
+    device.failure_rate = 1.0
+    for _ in range(FAILURE_THRESHOLD):
+        await coordinator.async_refresh_status()
+    requests = device.requests[PATH_STATUS]
+    assert coordinator.update_interval.total_seconds() == pytest.approx(
+        RESET_TIMEOUT, abs=1
+    )
+
+    await coordinator.async_refresh_status()
+    assert not coordinator.last_update_success
+    assert device.requests[PATH_STATUS] == requests
+
+
+async def test_restored_snapshot_is_stale_until_the_status_is_read(
+    hass, make_coordinator, device
+):
+    store = await async_get_device_store(hass)
+    store.set_snapshot(device.host, {ATTR_POWER: "off", ATTR_PM25: 3})
+
+    coordinator = await make_coordinator()
+    coordinator.restore_snapshot()
+    assert coordinator.data.stale
+    assert coordinator.data[ATTR_POWER] == "off"
+
+    await coordinator.async_refresh()
+    assert not coordinator.data.stale
+    assert coordinator.data[ATTR_POWER] == "on"
+    assert store.get_snapshot(device.host)[ATTR_PM25] == device.status["pm25"]
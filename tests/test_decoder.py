@@ -0,0 +1,119 @@
+"""Tests for decoding device responses into snapshots."""
+
+import pytest
+
+from custom_components.philips_airpurifier_http.const import (
+    ATTR_CHILD_LOCK,
+    ATTR_FAN_SPEED,
+    ATTR_FUNCTION,
+    ATTR_MODEL,
+    ATTR_PM25,
+    ATTR_POWER,
+    ATTR_PRE_FILTER,
+    ATTR_PRESET_MODE,
+    ATTR_STALE,
+    ATTR_USED_INDEX,
+    FUNCTION_BOTH,
+    MODE_AUTO,
+    SPEED_1,
+)
+from custom_components.philips_airpurifier_http.decoder import (
+    FIELDS,
+    DeviceSnapshot,
+    decode,
+)
+from custom_components.philips_airpurifier_http.scheduler import (
+    ENDPOINT_FILTERS,
+    ENDPOINT_STATUS,
+)
+
+STATUS = {
+    "pwr": "1",
+    "pm25": 8,
+    "func": "PH",
+    "mode": "P",
+    "om": "1",
+    "ddp": "1",
+    "cl": False,
+    "unknown": "ignored",
+}
+PERCENTAGES = {SPEED_1: 40}
+
+
+def test_decodes_values_through_their_maps():
+    snapshot = decode({ENDPOINT_STATUS: STATUS})
+
+    assert dict(snapshot) == {
+        ATTR_POWER: "on",
+        ATTR_PM25: 8,
+        ATTR_FUNCTION: FUNCTION_BOTH,
+        ATTR_PRESET_MODE: MODE_AUTO,
+        ATTR_FAN_SPEED: SPEED_1,
+        ATTR_USED_INDEX: "PM2.5",
+        ATTR_CHILD_LOCK: False,
+    }
+
+
+def test_unknown_values_are_kept_as_is():
+    snapshot = decode({ENDPOINT_STATUS: {"mode": "X"}})
+    assert snapshot[ATTR_PRESET_MODE] == "X"
+
+
+def test_missing_values_are_carried_over():
+    previous = decode({ENDPOINT_STATUS: STATUS})
+    snapshot = decode({ENDPOINT_FILTERS: {"fltsts0": 100}}, previous)
+
+    assert snapshot[ATTR_PM25] == 8
+    assert snapshot[ATTR_PRE_FILTER] == 100
+
+
+def test_only_the_given_fields_are_decoded():
+    fields = tuple(field for field in FIELDS if field.philips_key == "pwr")
+    snapshot = decode({ENDPOINT_STATUS: STATUS}, fields=fields)
+    assert dict(snapshot) == {ATTR_POWER: "on"}
+
+
+def test_snapshot_precomputes_attributes_and_percentage():
+    snapshot = decode({ENDPOINT_STATUS: STATUS}, None, "AC2729_10", PERCENTAGES)
+
+    assert snapshot.percentage == 40
+    assert snapshot.attributes == {
+        ATTR_MODEL: "AC2729_10",
+        ATTR_FUNCTION: FUNCTION_BOTH,
+        ATTR_USED_INDEX: "PM2.5",
+        ATTR_PM25: 8,
+        ATTR_CHILD_LOCK: False,
+    }
+    # Attribute order is the display order
+    assert list(snapshot.attributes)[:3] == [ATTR_MODEL, ATTR_FUNCTION, ATTR_USED_INDEX]
+
+
+def test_snapshot_is_immutable():
+    snapshot = decode({ENDPOINT_STATUS: STATUS})
+    with pytest.raises(AttributeError):
+        snapshot.percentage = 100
+    with pytest.raises(TypeError):
+        snapshot.attributes[ATTR_PM25] = 0
+    with pytest.raises(TypeError):
+        hash(snapshot)
+
+
+def test_equal_snapshots_mean_nothing_changed():
+    first = decode({ENDPOINT_STATUS: STATUS})
+    assert decode({ENDPOINT_STATUS: STATUS}) == first
+    assert decode({ENDPOINT_STATUS: {**STATUS, "pm25": 9}}) != first
+    assert decode({ENDPOINT_STATUS: STATUS}, model="AC2729_10") != first
+
+
+def test_stale_snapshot_stays_stale_until_the_status_is_read():
+    restored = DeviceSnapshot({ATTR_PM25: 8}, stale=True)
+    assert restored.attributes[ATTR_STALE] is True
+
+    filters = decode({ENDPOINT_FILTERS: {"fltsts0": 100}}, restored)
+    assert filters.stale
+    assert decode({}, restored).stale
+
+    status = decode({ENDPOINT_STATUS: STATUS}, filters)
+    assert not status.stale
+    assert ATTR_STALE not in status.attributes
+    assert status != filters
@@ -0,0 +1,46 @@
+"""Tests for diagnostics and the diagnostic sensors."""
+
+from homeassistant.const import CONF_HOST, CONF_NAME
+from homeassistant.helpers.entity_component import async_update_entity
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.philips_airpurifier_http.const import (
+    ATTR_PM25,
+    CONF_DIAGNOSTIC_SENSORS,
+    DOMAIN,
+)
+from custom_components.philips_airpurifier_http.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.philips_airpurifier_http.http_client import PATH_STATUS
+
+from .conftest import NAME
+
+
+async def test_diagnostics(hass, config_entry, polled_coordinator, device):
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert diagnostics["entry"]["data"][CONF_HOST] == "**REDACTED**"
+    assert diagnostics["entry"]["unique_id"] == "**REDACTED**"
+    assert diagnostics["model"] == device.model
+    assert diagnostics["circuit_breaker"] == "closed"
+    assert diagnostics["metrics"]["key_exchanges"] == 1
+    assert diagnostics["metrics"]["endpoints"][PATH_STATUS]["requests"] == 1
+    assert diagnostics["data"][ATTR_PM25] == device.status["pm25"]
+
+
+async def test_diagnostic_sensors(hass, device):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: device.host, CONF_NAME: NAME},
+        options={CONF_DIAGNOSTIC_SENSORS: True},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.data[DOMAIN][entry.entry_id].async_refresh_status()
+    # Metrics are polled, not pushed by the coordinator
+    await async_update_entity(hass, "sensor.living_room_key_exchanges")
+
+    assert hass.states.get("sensor.living_room_key_exchanges").state == "1"
+    assert hass.states.get("sensor.living_room_failed_requests").state == "0"
@@ -0,0 +1,146 @@
+"""Tests for the purifier entities."""
+
+import asyncio
+from unittest.mock import patch
+
+from homeassistant.components.fan import (
+    ATTR_PERCENTAGE,
+    ATTR_PRESET_MODE,
+    DOMAIN as FAN_DOMAIN,
+    SERVICE_SET_PERCENTAGE,
+    SERVICE_SET_PRESET_MODE,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+)
+from homeassistant.components.number import (
+    ATTR_VALUE,
+    DOMAIN as NUMBER_DOMAIN,
+    SERVICE_SET_VALUE,
+)
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    STATE_OFF,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.philips_airpurifier_http.http_client import (
+    PATH_STATUS,
+    AsyncHTTPAirClient,
+    PhilipsAirClientError,
+)
+
+FAN = "fan.living_room"
+
+
+async def call(hass, domain, service, entity_id, **data):
+    await hass.services.async_call(
+        domain, service, {ATTR_ENTITY_ID: entity_id, **data}, blocking=True
+    )
+
+
+async def test_entities_share_a_single_poll(hass, polled_coordinator, device):
+    state = hass.states.get(FAN)
+    assert state.state == STATE_ON
+    assert state.attributes["pm25"] == 8
+    assert hass.states.get("sensor.living_room_pm2_5").state == "8"
+    assert hass.states.get("switch.living_room_child_lock").state == "off"
+    assert hass.states.get("number.living_room_target_humidity").state == "50"
+    assert device.requests[PATH_STATUS] == 1
+
+
+async def test_turn_off(hass, polled_coordinator, device):
+    await hass.services.async_call(
+        FAN_DOMAIN, SERVICE_TURN_OFF, {ATTR_ENTITY_ID: FAN}, blocking=True
+    )
+    await hass.async_block_till_done()
+    assert device.status["pwr"] == "0"
+    assert hass.states.get(FAN).state == STATE_OFF
+
+
+async def test_turn_on_with_a_preset_mode_is_a_single_write(
+    hass, polled_coordinator, device
+):
+    device.status["pwr"] = "0"
+    await polled_coordinator.async_refresh_status()
+    reads = device.requests[PATH_STATUS]
+
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: FAN, ATTR_PRESET_MODE: "sleep"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert device.status["pwr"] == "1"
+    assert device.status["mode"] == "S"
+    # A single write, its response is the new status
+    assert device.requests[PATH_STATUS] == reads + 1
+    assert hass.states.get(FAN).attributes[ATTR_PRESET_MODE] == "sleep"
+
+
+async def test_rapid_changes_are_coalesced(hass, polled_coordinator, device):
+    writes = device.requests[PATH_STATUS]
+
+    await asyncio.gather(
+        call(hass, FAN_DOMAIN, SERVICE_SET_PRESET_MODE, FAN, preset_mode="manual"),
+        call(hass, FAN_DOMAIN, SERVICE_SET_PERCENTAGE, FAN, percentage=100),
+        call(hass, SWITCH_DOMAIN, "turn_on", "switch.living_room_child_lock"),
+    )
+
+    assert device.requests[PATH_STATUS] == writes + 1
+    assert device.status["mode"] == "M"
+    assert device.status["om"] == "t"
+    assert device.status["cl"] is True
+    assert hass.states.get(FAN).attributes[ATTR_PERCENTAGE] == 100
+
+
+async def test_number_sets_a_value(hass, polled_coordinator, device):
+    await call(
+        hass,
+        NUMBER_DOMAIN,
+        SERVICE_SET_VALUE,
+        "number.living_room_timer",
+        **{ATTR_VALUE: 2},
+    )
+    assert device.status["dt"] == 2
+    assert hass.states.get("number.living_room_timer").state == "2"
+
+
+@pytest.mark.parametrize(
+    ("domain", "service", "entity_id"),
+    [
+        (FAN_DOMAIN, SERVICE_TURN_OFF, FAN),
+        (SWITCH_DOMAIN, "turn_on", "switch.living_room_child_lock"),
+    ],
+)
+async def test_write_errors_are_raised(
+    hass, polled_coordinator, device, domain, service, entity_id
+):
+    device.failure_rate = 1.0
+    with pytest.raises(HomeAssistantError, match="Error setting new values"):
+        await call(hass, domain, service, entity_id)
+
+
+async def test_filter_errors_keep_the_fan_available(hass, coordinator, device):
+    with patch.object(
+        AsyncHTTPAirClient,
+        "async_get_filters",
+        side_effect=PhilipsAirClientError("down"),
+    ):
+        await coordinator.async_refresh_status()
+        await hass.async_block_till_done()
+
+    assert hass.states.get(FAN).state == STATE_ON
+    assert hass.states.get("sensor.living_room_pre_filter").state == STATE_UNAVAILABLE
+
+
+async def test_status_errors_make_the_fan_unavailable(hass, polled_coordinator, device):
+    device.failure_rate = 1.0
+    await polled_coordinator.async_refresh_status()
+    await hass.async_block_till_done()
+    assert hass.states.get(FAN).state == STATE_UNAVAILABLE
@@ -0,0 +1,58 @@
+"""Tests for the fleet-wide load control."""
+
+import asyncio
+
+from custom_components.philips_airpurifier_http.fleet import (
+    STAGGER_WINDOW,
+    FleetLimiter,
+    TokenBucket,
+)
+
+
+async def test_limits_requests_in_flight():
+    limiter = FleetLimiter(max_concurrent=2, max_per_second=1000)
+    in_flight = 0
+    most = 0
+
+    async def request():
+        nonlocal in_flight, most
+        async with limiter.async_request():
+            in_flight += 1
+            most = max(most, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    assert most == 2
+
+
+async def test_token_bucket_allows_bursts_then_waits(monkeypatch):
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+        bucket._tokens += delay * 2
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    bucket = TokenBucket(rate=2, capacity=2)
+    for _ in range(3):
+        await bucket.async_acquire()
+
+    assert len(sleeps) == 1
+
+
+def test_start_offsets_are_spread_over_the_stagger_window():
+    limiter = FleetLimiter()
+    offsets = [limiter.next_start_offset(30) for _ in range(10)]
+
+    assert all(0 < offset < STAGGER_WINDOW for offset in offsets)
+    assert len({round(offset, 3) for offset in offsets}) == 10
+    # Every device gets its own part of the window
+    gaps = [b - a for a, b in zip(sorted(offsets), sorted(offsets)[1:])]
+    assert min(gaps) > STAGGER_WINDOW / 100
+
+
+def test_short_intervals_and_restored_devices():
+    limiter = FleetLimiter()
+    assert limiter.next_start_offset(5) < 5
+    assert limiter.next_start_offset(60, restored=True) > STAGGER_WINDOW
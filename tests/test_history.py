@@ -0,0 +1,74 @@
+"""Tests for the in-memory reading history."""
+
+import random
+
+from custom_components.philips_airpurifier_http.const import ATTR_HUMIDITY, ATTR_PM25
+from custom_components.philips_airpurifier_http.history import ReadingHistory
+
+
+def test_statistics_over_a_window():
+    history = ReadingHistory(size=10)
+    for timestamp, pm25 in ((0, 10), (60, 20), (120, 30)):
+        history.append(timestamp, {ATTR_PM25: pm25})
+
+    assert history.statistics(ATTR_PM25, 3600, 120) == {
+        "min": 10,
+        "max": 30,
+        "mean": 20,
+        "count": 3,
+    }
+    assert history.statistics(ATTR_PM25, 60, 120)["count"] == 2
+    assert history.statistics(ATTR_HUMIDITY, 3600, 120) is None
+
+
+def test_oldest_readings_are_overwritten():
+    history = ReadingHistory(size=3)
+    for timestamp in range(5):
+        history.append(timestamp, {ATTR_PM25: timestamp})
+
+    assert len(history) == 3
+    assert history.statistics(ATTR_PM25, 10, 4) == {
+        "min": 2,
+        "max": 4,
+        "mean": 3,
+        "count": 3,
+    }
+
+
+def test_downsample_averages_buckets():
+    history = ReadingHistory(size=10)
+    for timestamp, pm25 in ((0, 10), (30, 20), (60, 5), (200, 7)):
+        history.append(timestamp, {ATTR_PM25: pm25})
+
+    assert history.downsample(ATTR_PM25, 3600, 60, 200) == [
+        (0, 15),
+        (60, 5),
+        (180, 7),
+    ]
+
+
+def test_summary_forgets_readings_leaving_the_window():
+    history = ReadingHistory(size=10, window=100)
+    history.append(0, {ATTR_PM25: 50})
+    history.append(50, {ATTR_PM25: 10, ATTR_HUMIDITY: 40})
+    assert history.summary(ATTR_PM25) == {"min": 10, "max": 50, "mean": 30, "count": 2}
+
+    history.append(120, {ATTR_PM25: 20})
+    assert history.summary(ATTR_PM25) == {"min": 10, "max": 20, "mean": 15, "count": 2}
+    assert history.summary(ATTR_HUMIDITY)["count"] == 1
+
+    history.append(1000, {})
+    assert history.summary(ATTR_PM25) is None
+
+
+def test_summary_matches_statistics():
+    rng = random.Random(42)
+    history = ReadingHistory(size=50, window=600)
+    timestamp = 0
+    for _ in range(500):
+        timestamp += rng.randint(1, 60)
+        reading = {} if rng.random() < 0.1 else {ATTR_PM25: rng.randint(0, 100)}
+        history.append(timestamp, reading)
+        assert history.summary(ATTR_PM25) == history.statistics(
+            ATTR_PM25, 600, timestamp
+        )
@@ -0,0 +1,157 @@
+"""Tests for the device HTTP client, against an emulated purifier."""
+
+import asyncio
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import pytest
+
+from custom_components.philips_airpurifier_http.breaker import (
+    FAILURE_THRESHOLD,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+from custom_components.philips_airpurifier_http.http_client import (
+    PATH_FIRMWARE,
+    PATH_SECURITY,
+    PATH_STATUS,
+    AsyncHTTPAirClient,
+    PhilipsAirClientError,
+    PhilipsAirSupersededError,
+    PhilipsAirUnreachableError,
+)
+
+
+async def wait_for_request(device, path, count=1):
+    """Wait until the device received count requests to path."""
+    while device.requests[path] < count:
+        await asyncio.sleep(0.01)
+
+
+async def test_exchanges_a_key_once(client, device):
+    keys = []
+    client.add_key_listener(keys.append)
+
+    status = await client.async_get_status()
+    filters = await client.async_get_filters()
+    firmware = await client.async_get_firmware()
+
+    assert status == device.status
+    assert filters == device.filters
+    assert firmware["name"] == device.model
+    assert keys == [device.session_key]
+    assert device.requests[PATH_SECURITY] == 1
+    assert client.metrics.key_exchanges == 1
+    assert client.metrics.endpoint(PATH_STATUS).requests == 1
+
+
+async def test_reuses_a_saved_key(hass, client, device):
+    await client.async_get_status()
+    restarted = AsyncHTTPAirClient(
+        device.host, async_get_clientsession(hass), device.session_key
+    )
+
+    assert await restarted.async_get_status() == device.status
+    assert device.requests[PATH_SECURITY] == 1
+    assert restarted.metrics.key_exchanges == 0
+
+
+async def test_concurrent_requests_share_one_key_exchange(client, device):
+    await asyncio.gather(
+        client.async_get_status(),
+        client.async_get_filters(),
+        client.async_get_firmware(),
+    )
+    assert device.requests[PATH_SECURITY] == 1
+
+
+async def test_renegotiates_a_rejected_key(client, device):
+    rekeyed = []
+    client.add_rekey_listener(lambda: rekeyed.append(True))
+    await client.async_get_status()
+
+    device.reboot()
+    assert await client.async_get_status() == device.status
+    assert rekeyed == [True]
+    assert device.requests[PATH_SECURITY] == 2
+
+
+async def test_set_values_returns_the_status(client, device):
+    status = await client.async_set_values({"pwr": "0"})
+    assert status["pwr"] == "0"
+    assert device.status["pwr"] == "0"
+
+
+async def test_write_is_sent_again_after_rekeying(client, device):
+    await client.async_get_status()
+    device.reboot()
+
+    status = await client.async_set_values({"pwr": "0"})
+    assert status["pwr"] == "0"
+    assert device.status["pwr"] == "0"
+
+
+async def test_error_responses_raise(client, device):
+    device.failure_rate = 1.0
+    with pytest.raises(PhilipsAirClientError):
+        await client.async_get_status()
+
+
+async def test_breaker_opens_on_error_responses(client, device):
+    await client.async_get_status()
+    device.failure_rate = 1.0
+    for _ in range(FAILURE_THRESHOLD):
+        with pytest.raises(PhilipsAirClientError):
+            await client.async_get_status()
+    assert client.breaker.state == STATE_OPEN
+    assert client.metrics.failures == FAILURE_THRESHOLD
+
+    with pytest.raises(PhilipsAirUnreachableError):
+        await client.async_get_status()
+    assert device.requests[PATH_STATUS] == 1 + FAILURE_THRESHOLD
+
+
+async def test_cancelled_probe_does_not_block_the_next_one(client, device):
+    await client.async_get_status()
+    client.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    client.breaker.record_failure()
+
+    device.latency = 1
+    task = asyncio.ensure_future(client.async_get_status())
+    await wait_for_request(device, PATH_STATUS, 2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    device.latency = 0
+    assert await client.async_get_status() == device.status
+
+
+async def test_command_supersedes_status_polls(client, device):
+    await client.async_get_status()
+    device.latency = 0.2
+
+    firmware = asyncio.ensure_future(client.async_get_firmware())
+    await wait_for_request(device, PATH_FIRMWARE)
+    status = asyncio.ensure_future(client.async_get_status())
+    await asyncio.sleep(0)
+    answer = await client.async_set_values({"pwr": "0"})
+
+    assert answer["pwr"] == "0"
+    assert (await firmware)["name"] == device.model
+    with pytest.raises(PhilipsAirSupersededError):
+        await status
+    assert device.requests[PATH_STATUS] == 2
+
+
+async def test_command_cancels_a_status_poll_in_flight(client, device):
+    await client.async_get_status()
+    device.latency = 0.2
+
+    status = asyncio.ensure_future(client.async_get_status())
+    await wait_for_request(device, PATH_STATUS, 2)
+    await client.async_set_values({"pwr": "0"})
+
+    with pytest.raises(PhilipsAirSupersededError):
+        await status
+    # Not a failure of the device
+    assert client.metrics.failures == 0
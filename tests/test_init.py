@@ -0,0 +1,125 @@
+"""Tests for setting up and unloading purifiers."""
+
+import asyncio
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, STATE_ON, STATE_UNAVAILABLE
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.philips_airpurifier_http.const import (
+    ATTR_MODEL,
+    ATTR_POWER,
+    ATTR_STALE,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_REQUESTS_PER_SECOND,
+    CONF_STATUS_INTERVAL,
+    DOMAIN,
+)
+from custom_components.philips_airpurifier_http.fleet import (
+    FleetLimiter,
+    get_fleet_limiter,
+)
+from custom_components.philips_airpurifier_http.http_client import PATH_STATUS
+from custom_components.philips_airpurifier_http.registry import get_fan_registry
+from custom_components.philips_airpurifier_http.store import async_get_device_store
+from startup_benchmark import measure_import
+
+from .conftest import NAME
+
+FAN = "fan.living_room"
+
+
+async def test_setup_does_not_wait_for_the_device(hass, coordinator, device):
+    assert not device.requests
+    assert hass.states.get(FAN).state == STATE_UNAVAILABLE
+
+    await coordinator.async_refresh_status()
+    await hass.async_block_till_done()
+    assert hass.states.get(FAN).state == STATE_ON
+    assert hass.states.get("sensor.living_room_pm2_5").state == "8"
+    assert hass.states.get("switch.living_room_child_lock").state == "off"
+    assert hass.states.get("number.living_room_target_humidity").state == "50"
+
+
+async def test_first_device_is_polled(hass, device):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: device.host, "name": NAME},
+        options={CONF_STATUS_INTERVAL: 1},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+
+    # The first poll is only scheduled, wait for its answer to be applied
+    for _ in range(30):
+        await asyncio.sleep(0.1)
+        await hass.async_block_till_done()
+        if hass.states.get(FAN).state == STATE_ON:
+            break
+    assert device.requests[PATH_STATUS]
+    assert hass.states.get(FAN).state == STATE_ON
+
+
+async def test_entities_follow_the_model(hass, config_entry, device):
+    store = await async_get_device_store(hass)
+    store.set(device.host, ATTR_MODEL, "AC2889_10")
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(FAN) is not None
+    assert hass.states.get("sensor.living_room_pm2_5") is not None
+    assert hass.states.get("sensor.living_room_humidity") is None
+    assert hass.states.get("number.living_room_target_humidity") is None
+
+
+async def test_restored_state_is_shown_right_away(hass, config_entry, device):
+    store = await async_get_device_store(hass)
+    store.set_snapshot(device.host, {ATTR_POWER: "off"})
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(FAN)
+    assert state.state == "off"
+    assert state.attributes[ATTR_STALE] is True
+    assert not device.requests
+
+
+async def test_unload(hass, config_entry, coordinator):
+    assert len(get_fan_registry(hass)) == 1
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.NOT_LOADED
+    assert not hass.data[DOMAIN]
+    assert not len(get_fan_registry(hass))
+
+
+async def test_fleet_limits_from_yaml(hass):
+    assert await async_setup_component(
+        hass,
+        DOMAIN,
+        {DOMAIN: {CONF_MAX_CONCURRENT_REQUESTS: 2, CONF_MAX_REQUESTS_PER_SECOND: 5}},
+    )
+    limiter = get_fleet_limiter(hass)
+    assert isinstance(limiter, FleetLimiter)
+    assert get_fleet_limiter(hass) is limiter
+
+
+async def test_yaml_purifiers_are_imported(hass, device):
+    assert await async_setup_component(
+        hass, "fan", {"fan": [{"platform": DOMAIN, "host": device.host}]}
+    )
+    # The import reads the device in the background
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    entries = hass.config_entries.async_entries(DOMAIN)
+    assert len(entries) == 1
+    assert entries[0].unique_id == device.mac_address
+
+
+def test_importing_the_integration_skips_the_crypto_stack():
+    assert not measure_import()["crypto_imported"]
@@ -0,0 +1,28 @@
+"""Tests for the request metrics."""
+
+from custom_components.philips_airpurifier_http.metrics import ClientMetrics
+
+
+def test_records_requests_per_endpoint():
+    metrics = ClientMetrics()
+    status = metrics.endpoint("/status")
+    status.record_success(0.04)
+    status.record_success(0.3)
+    status.record_success(30)
+    status.record_error(timeout=True)
+    metrics.endpoint("/filters").record_error()
+
+    assert metrics.endpoint("/status") is status
+    assert metrics.failures == 2
+
+    data = metrics.as_dict()
+    assert data["key_exchanges"] == 0
+    status_data = data["endpoints"]["/status"]
+    assert status_data["requests"] == 4
+    assert status_data["timeouts"] == 1
+    assert status_data["average_latency"] == (0.04 + 0.3 + 30) / 3
+    assert status_data["latency_histogram"]["0.05"] == 1
+    assert status_data["latency_histogram"]["0.5"] == 1
+    assert status_data["latency_histogram"]["+Inf"] == 1
+    assert status_data["last_success"] is not None
+    assert data["endpoints"]["/filters"]["average_latency"] is None
@@ -0,0 +1,43 @@
+"""Tests for the model profiles."""
+
+from custom_components.philips_airpurifier_http.const import ATTR_HUMIDITY, ATTR_PM25
+from custom_components.philips_airpurifier_http.model_config import (
+    DEVICE_CONFIG_ATTRIBUTES,
+    DEVICE_CONFIG_ENDPOINTS,
+    DEVICE_CONFIG_KEYS,
+    DEVICE_CONFIG_SPEED_PERCENTAGES,
+    DEVICE_CONFIG_SPEEDS,
+    MODELS_PATH,
+    load_model_config,
+    unsupported_keys,
+)
+from custom_components.philips_airpurifier_http.scheduler import (
+    ENDPOINT_FIRMWARE,
+    ENDPOINT_STATUS,
+)
+
+
+def test_every_profile_loads():
+    for path in MODELS_PATH.glob("*.json"):
+        model_config = load_model_config(path.stem)
+        speeds = model_config[DEVICE_CONFIG_SPEEDS]
+        percentages = model_config[DEVICE_CONFIG_SPEED_PERCENTAGES]
+        assert list(percentages) == speeds
+        assert percentages[speeds[-1]] == 100
+        assert ENDPOINT_FIRMWARE in model_config[DEVICE_CONFIG_ENDPOINTS]
+        assert ENDPOINT_STATUS in model_config[DEVICE_CONFIG_ENDPOINTS]
+
+
+def test_unknown_models_use_the_default_profile():
+    default = load_model_config(None)
+    assert load_model_config("AC0000_00") == default
+    assert load_model_config("../manifest") == default
+    assert default[DEVICE_CONFIG_KEYS] is None
+    assert unsupported_keys(default, {"anything": 1}) == []
+
+
+def test_profiles_limit_keys_and_attributes():
+    model_config = load_model_config("AC2729_10")
+    assert ATTR_PM25 in model_config[DEVICE_CONFIG_ATTRIBUTES]
+    assert ATTR_HUMIDITY in model_config[DEVICE_CONFIG_ATTRIBUTES]
+    assert unsupported_keys(model_config, {"pwr": "1", "bogus": 1}) == ["bogus"]
@@ -0,0 +1,41 @@
+"""Tests for the fan registry."""
+
+from types import SimpleNamespace
+
+from custom_components.philips_airpurifier_http.registry import PhilipsFanRegistry
+
+
+def make_fan(entity_id, host, mac_address=None):
+    coordinator = SimpleNamespace(host=host, mac_address=mac_address)
+    return SimpleNamespace(entity_id=entity_id, coordinator=coordinator)
+
+
+def test_resolve():
+    registry = PhilipsFanRegistry()
+    kitchen = make_fan("fan.kitchen", "192.168.1.2")
+    bedroom = make_fan("fan.bedroom", "192.168.1.3")
+    registry.add(kitchen)
+    registry.add(bedroom)
+
+    assert len(registry) == 2
+    assert registry.get("fan.kitchen") is kitchen
+    assert registry.resolve(None) == [kitchen, bedroom]
+    assert registry.resolve(["fan.bedroom", "fan.unknown"]) == [bedroom]
+
+
+def test_remove_drops_every_index_key():
+    registry = PhilipsFanRegistry()
+    fan = make_fan("fan.kitchen", "192.168.1.2", "aa:bb")
+    other = make_fan("fan.bedroom", "192.168.1.3", "cc:dd")
+    registry.add(fan)
+    registry.add(other)
+    fan.coordinator.mac_address = "ee:ff"
+    registry.index_mac_address(fan)
+
+    registry.remove(fan)
+
+    assert list(registry) == [other]
+    assert registry.get("fan.kitchen") is None
+    # pylint: disable=protected-access
+    assert registry._by_host == {"192.168.1.3": other}
+    assert registry._by_mac_address == {"cc:dd": other}
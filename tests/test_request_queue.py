@@ -0,0 +1,118 @@
+"""Tests for the per-device request queue."""
+
+import asyncio
+
+import pytest
+
+from custom_components.philips_airpurifier_http.request_queue import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    RequestQueue,
+    RequestSupersededError,
+)
+
+
+async def settle():
+    """Let started tasks run until they wait."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def request(log, name, release=None):
+    """Return a request that logs its name, waiting for release if given."""
+
+    async def run():
+        log.append(name)
+        if release is not None:
+            await release.wait()
+        return name
+
+    return run
+
+
+async def test_runs_one_request_at_a_time():
+    queue = RequestQueue()
+    log = []
+    release = asyncio.Event()
+    first = asyncio.create_task(queue.async_run(request(log, "first", release)))
+    second = asyncio.create_task(queue.async_run(request(log, "second")))
+    await settle()
+    assert log == ["first"]
+
+    release.set()
+    assert await first == "first"
+    assert await second == "second"
+    assert log == ["first", "second"]
+
+
+async def test_commands_go_ahead_of_polls():
+    queue = RequestQueue()
+    log = []
+    release = asyncio.Event()
+    active = asyncio.create_task(queue.async_run(request(log, "active", release)))
+    await settle()
+    tasks = [
+        asyncio.create_task(queue.async_run(request(log, "poll"), PRIORITY_POLL)),
+        asyncio.create_task(queue.async_run(request(log, "command"), PRIORITY_COMMAND)),
+    ]
+    await settle()
+
+    release.set()
+    await asyncio.gather(active, *tasks)
+    assert log == ["active", "command", "poll"]
+
+
+async def test_command_supersedes_waiting_and_active_polls():
+    queue = RequestQueue()
+    log = []
+    release = asyncio.Event()
+    active = asyncio.create_task(
+        queue.async_run(request(log, "active", release), supersedable=True)
+    )
+    await settle()
+    waiting = asyncio.create_task(
+        queue.async_run(request(log, "waiting"), supersedable=True)
+    )
+    kept = asyncio.create_task(queue.async_run(request(log, "kept")))
+    await settle()
+
+    assert await queue.async_run(request(log, "command"), PRIORITY_COMMAND) == (
+        "command"
+    )
+    with pytest.raises(RequestSupersededError):
+        await active
+    with pytest.raises(RequestSupersededError):
+        await waiting
+    assert await kept == "kept"
+    assert log == ["active", "command", "kept"]
+
+
+async def test_caller_cancellation_is_not_superseding():
+    queue = RequestQueue()
+    release = asyncio.Event()
+    active = asyncio.create_task(
+        queue.async_run(request([], "active", release), supersedable=True)
+    )
+    await settle()
+
+    active.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await active
+    # The turn was released
+    assert await queue.async_run(request([], "next")) == "next"
+
+
+async def test_cancelled_waiter_passes_the_turn_on():
+    queue = RequestQueue()
+    log = []
+    release = asyncio.Event()
+    active = asyncio.create_task(queue.async_run(request(log, "active", release)))
+    await settle()
+    cancelled = asyncio.create_task(queue.async_run(request(log, "cancelled")))
+    waiting = asyncio.create_task(queue.async_run(request(log, "waiting")))
+    await settle()
+
+    cancelled.cancel()
+    release.set()
+    await asyncio.gather(active, waiting)
+    assert log == ["active", "waiting"]
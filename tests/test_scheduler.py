@@ -0,0 +1,119 @@
+"""Tests for the tiered polling schedule."""
+
+import pytest
+
+from custom_components.philips_airpurifier_http import scheduler as scheduler_module
+from custom_components.philips_airpurifier_http.scheduler import (
+    BURST_INTERVAL,
+    BURST_POLLS,
+    ENDPOINT_FILTERS,
+    ENDPOINT_FIRMWARE,
+    ENDPOINT_STATUS,
+    MAX_ERROR_BACKOFF,
+    OFF_BACKOFF,
+    PollScheduler,
+)
+
+INTERVALS = {ENDPOINT_STATUS: 30, ENDPOINT_FILTERS: 1800, ENDPOINT_FIRMWARE: 86400}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the monotonic clock of the scheduler with a settable one."""
+    now = [1000.0]
+    monkeypatch.setattr(scheduler_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def scheduler(clock):
+    """Return a scheduler without jitter, due right away."""
+    return PollScheduler(INTERVALS, jitter=0, start_offset=0)
+
+
+def test_everything_is_due_first(scheduler):
+    assert scheduler.due_endpoints() == set(INTERVALS)
+    assert scheduler.seconds_until_due() == 0
+
+
+def test_start_offset_delays_the_first_poll(clock):
+    scheduler = PollScheduler(INTERVALS, jitter=0, start_offset=5)
+    assert scheduler.due_endpoints() == set()
+    assert scheduler.seconds_until_due() == 5
+
+
+def test_endpoints_have_their_own_interval(scheduler, clock):
+    for endpoint in INTERVALS:
+        scheduler.record_success(endpoint)
+
+    clock[0] += 30
+    assert scheduler.due_endpoints() == {ENDPOINT_STATUS}
+    scheduler.record_success(ENDPOINT_STATUS)
+    assert scheduler.seconds_until_due() == 30
+
+    clock[0] += 1800
+    assert scheduler.due_endpoints() == {ENDPOINT_STATUS, ENDPOINT_FILTERS}
+
+
+def test_jitter_spreads_the_polls(clock):
+    scheduler = PollScheduler(INTERVALS, jitter=0.1)
+    assert scheduler.seconds_until_due() <= 3
+    for endpoint in INTERVALS:
+        scheduler.record_success(endpoint)
+    assert 27 <= scheduler.seconds_until_due() <= 33
+
+
+def test_status_backs_off_while_powered_off(scheduler, clock):
+    for endpoint in INTERVALS:
+        scheduler.record_success(endpoint, powered_off=True)
+    assert scheduler.seconds_until_due() == 30 * OFF_BACKOFF
+
+    clock[0] += 30 * OFF_BACKOFF
+    assert scheduler.due_endpoints() == {ENDPOINT_STATUS}
+
+
+def test_unchanged_status_keeps_its_interval(scheduler, clock):
+    for endpoint in INTERVALS:
+        scheduler.record_success(endpoint)
+    for _ in range(20):
+        clock[0] += 30
+        scheduler.record_success(ENDPOINT_STATUS)
+        assert scheduler.seconds_until_due() == 30
+
+
+def test_failures_back_off_exponentially(scheduler, clock):
+    for endpoint in INTERVALS:
+        scheduler.record_success(endpoint)
+    delays = []
+    for _ in range(6):
+        scheduler.record_failure(ENDPOINT_STATUS)
+        delays.append(scheduler.seconds_until_due())
+    assert delays == [30 * backoff for backoff in (2, 4, 8, 16, 16, 16)]
+    assert max(delays) == 30 * MAX_ERROR_BACKOFF
+
+    scheduler.record_success(ENDPOINT_STATUS)
+    assert scheduler.seconds_until_due() == 30
+
+
+def test_request_refresh_makes_an_endpoint_due(scheduler):
+    scheduler.record_success(ENDPOINT_FILTERS)
+    scheduler.request_refresh(ENDPOINT_FILTERS)
+    assert ENDPOINT_FILTERS in scheduler.due_endpoints()
+
+
+def test_burst_polls_quickly_for_a_while(scheduler, clock):
+    for endpoint in INTERVALS:
+        scheduler.record_success(endpoint)
+    scheduler.burst(ENDPOINT_STATUS)
+    assert scheduler.seconds_until_due() == BURST_INTERVAL
+
+    for _ in range(BURST_POLLS):
+        scheduler.record_success(ENDPOINT_STATUS)
+        assert scheduler.seconds_until_due() == BURST_INTERVAL
+    scheduler.record_success(ENDPOINT_STATUS)
+    assert scheduler.seconds_until_due() == 30
+
+
+def test_disabled_endpoints_are_never_due(scheduler):
+    scheduler.set_enabled({ENDPOINT_STATUS, ENDPOINT_FIRMWARE})
+    assert scheduler.due_endpoints() == {ENDPOINT_STATUS, ENDPOINT_FIRMWARE}
@@ -0,0 +1,124 @@
+"""Tests for the domain services."""
+
+from homeassistant.const import ATTR_ENTITY_ID, CONF_HOST, CONF_NAME
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.philips_airpurifier_http.const import (
+    DOMAIN,
+    SERVICE_APPLY_STATE,
+    SERVICE_GET_HISTORY,
+    SERVICE_SET_CHILD_LOCK,
+    SERVICE_SET_FUNCTION,
+)
+from custom_components.philips_airpurifier_http.http_client import PATH_STATUS
+from emulator import EmulatedDevice
+
+FAN = "fan.living_room"
+OTHER_FAN = "fan.bedroom"
+
+
+@pytest.fixture
+async def other_device(hass, polled_coordinator):
+    """Set up a second emulated purifier next to the first one."""
+    device = EmulatedDevice(drift=False)
+    await device.async_start()
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: device.host, CONF_NAME: "Bedroom"},
+        unique_id=device.mac_address,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.data[DOMAIN][entry.entry_id].async_refresh_status()
+    await hass.async_block_till_done()
+
+    yield device
+    await hass.config_entries.async_unload(entry.entry_id)
+    await device.async_stop()
+
+
+async def test_service_targets_every_fan(hass, device, other_device):
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_CHILD_LOCK,
+        {ATTR_ENTITY_ID: [FAN, OTHER_FAN], "lock": True},
+        blocking=True,
+    )
+    assert device.status["cl"] is True
+    assert other_device.status["cl"] is True
+
+
+async def test_failures_name_the_device_and_reason(hass, device, other_device):
+    other_device.failure_rate = 1.0
+    with pytest.raises(HomeAssistantError) as excinfo:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_FUNCTION,
+            {ATTR_ENTITY_ID: [FAN, OTHER_FAN], "function": "Purification"},
+            blocking=True,
+        )
+
+    message = str(excinfo.value)
+    assert "failed for 1 of 2 devices" in message
+    assert OTHER_FAN in message
+    assert "Error setting new values" in message
+    # The other purifier was set anyway
+    assert device.status["func"] == "P"
+
+
+async def test_apply_state_is_a_single_write(hass, polled_coordinator, device):
+    writes = device.requests[PATH_STATUS]
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_APPLY_STATE,
+        {
+            ATTR_ENTITY_ID: FAN,
+            "power": True,
+            "preset_mode": "manual",
+            "percentage": 20,
+            "lock": True,
+            "light": False,
+        },
+        blocking=True,
+    )
+
+    assert device.requests[PATH_STATUS] == writes + 1
+    assert device.status["mode"] == "M"
+    assert device.status["om"] == "s"
+    assert device.status["cl"] is True
+    assert device.status["uil"] == "0"
+
+
+async def test_apply_state_rejects_unsupported_preset_modes(
+    hass, polled_coordinator, device
+):
+    writes = device.requests[PATH_STATUS]
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_APPLY_STATE,
+            {ATTR_ENTITY_ID: FAN, "preset_mode": "night"},
+            blocking=True,
+        )
+    assert device.requests[PATH_STATUS] == writes
+
+
+async def test_get_history(hass, polled_coordinator, device):
+    device.status["pm25"] = 20
+    await polled_coordinator.async_refresh_status()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        {ATTR_ENTITY_ID: FAN, "attribute": "pm25"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response[FAN]["statistics"] == {"min": 8, "max": 20, "mean": 14, "count": 2}
+    assert len(response[FAN]["readings"]) in (1, 2)
+    assert hass.states.get("sensor.living_room_pm2_5").attributes["max"] == 20
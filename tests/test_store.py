@@ -0,0 +1,70 @@
+"""Tests for the persistent device store."""
+
+from datetime import timedelta
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.philips_airpurifier_http.const import (
+    ATTR_MODEL,
+    ATTR_POWER,
+)
+from custom_components.philips_airpurifier_http.store import (
+    SAVE_DELAY,
+    SNAPSHOTS_SAVE_INTERVAL,
+    SNAPSHOTS_STORAGE_KEY,
+    STORAGE_KEY,
+    PhilipsDeviceStore,
+    async_get_device_store,
+)
+
+HOST = "192.168.1.2"
+
+
+async def test_values_are_saved_and_loaded(hass, hass_storage):
+    store = await async_get_device_store(hass)
+    assert await async_get_device_store(hass) is store
+
+    store.set(HOST, ATTR_MODEL, "AC2729_10")
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SAVE_DELAY))
+    await hass.async_block_till_done()
+    assert hass_storage[STORAGE_KEY]["data"] == {
+        "devices": {HOST: {ATTR_MODEL: "AC2729_10"}}
+    }
+
+    loaded = await PhilipsDeviceStore(hass).async_load()
+    assert loaded.get(HOST, ATTR_MODEL) == "AC2729_10"
+
+    store.remove(HOST, ATTR_MODEL)
+    assert store.get(HOST, ATTR_MODEL) is None
+
+
+async def test_snapshots_are_saved_at_a_steady_pace(hass, hass_storage):
+    store = await async_get_device_store(hass)
+    store.set_snapshot(HOST, {ATTR_POWER: "on"})
+
+    # Later snapshots don't push the save back
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOTS_SAVE_INTERVAL - 1)
+    )
+    store.set_snapshot(HOST, {ATTR_POWER: "off"})
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOTS_SAVE_INTERVAL)
+    )
+    await hass.async_block_till_done()
+
+    assert hass_storage[SNAPSHOTS_STORAGE_KEY]["data"] == {
+        "snapshots": {HOST: {ATTR_POWER: "off"}}
+    }
+    assert STORAGE_KEY not in hass_storage
+
+
+async def test_snapshots_are_saved_on_shutdown(hass, hass_storage):
+    store = await async_get_device_store(hass)
+    store.set_snapshot(HOST, {ATTR_POWER: "on"})
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    assert hass_storage[SNAPSHOTS_STORAGE_KEY]["data"]["snapshots"] == {
+        HOST: {ATTR_POWER: "on"}
+    }
@@ -0,0 +1,21 @@
+"""Tests for the value maps."""
+
+from custom_components.philips_airpurifier_http.const import (
+    DISPLAY_LIGHT_MAP,
+    MODE_MAP,
+    SPEED_MAP,
+)
+from custom_components.philips_airpurifier_http.value_map import ValueMap
+
+
+def test_maps_both_ways():
+    value_map = ValueMap({"P": "auto", "M": "manual"})
+    assert value_map["P"] == "auto"
+    assert value_map.encode("manual") == "M"
+    assert value_map.encode("unknown") is None
+
+
+def test_constant_maps_round_trip():
+    for value_map in (MODE_MAP, SPEED_MAP, DISPLAY_LIGHT_MAP):
+        for key, value in value_map.items():
+            assert value_map.encode(value) == key
@@ -0,0 +1,106 @@
+"""Tests for write coalescing."""
+
+import asyncio
+
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.philips_airpurifier_http.write_queue import WriteQueue
+
+
+class FakeDevice:
+    """Record the writes a queue sends."""
+
+    def __init__(self):
+        self.writes = []
+        self.error = None
+        self.release = None
+
+    async def async_write(self, values):
+        self.writes.append(values)
+        if self.release is not None:
+            await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return {"written": len(self.writes), **values}
+
+
+async def test_merges_writes_within_the_delay(hass):
+    device = FakeDevice()
+    queue = WriteQueue(hass, device.async_write, 0.01)
+
+    results = await asyncio.gather(
+        queue.async_set_values({"om": "1", "mode": "M"}),
+        queue.async_set_values({"aqil": 50}),
+        queue.async_set_values({"om": "2"}),
+    )
+
+    assert device.writes == [{"om": "2", "mode": "M", "aqil": 50}]
+    assert results == [{"written": 1, "om": "2", "mode": "M", "aqil": 50}] * 3
+
+
+async def test_later_writes_are_sent_separately(hass):
+    device = FakeDevice()
+    queue = WriteQueue(hass, device.async_write, 0)
+
+    await queue.async_set_values({"om": "1"})
+    await queue.async_set_values({"om": "2"})
+
+    assert device.writes == [{"om": "1"}, {"om": "2"}]
+
+
+async def test_batches_are_sent_in_order(hass):
+    device = FakeDevice()
+    device.release = asyncio.Event()
+    queue = WriteQueue(hass, device.async_write, 0)
+
+    first = asyncio.create_task(queue.async_set_values({"om": "1"}))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(queue.async_set_values({"om": "2"}))
+    await asyncio.sleep(0.01)
+    assert device.writes == [{"om": "1"}]
+
+    device.release.set()
+    await asyncio.gather(first, second)
+    assert device.writes == [{"om": "1"}, {"om": "2"}]
+
+
+async def test_errors_reach_every_caller(hass):
+    device = FakeDevice()
+    device.error = ValueError("unreachable")
+    queue = WriteQueue(hass, device.async_write, 0.01)
+
+    results = await asyncio.gather(
+        queue.async_set_values({"om": "1"}),
+        queue.async_set_values({"cl": True}),
+        return_exceptions=True,
+    )
+
+    assert [str(result) for result in results] == ["unreachable"] * 2
+
+
+async def test_cancel_drops_pending_values(hass):
+    device = FakeDevice()
+    queue = WriteQueue(hass, device.async_write, 10)
+    pending = asyncio.create_task(queue.async_set_values({"om": "1"}))
+    await asyncio.sleep(0)
+
+    queue.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    assert device.writes == []
+
+
+async def test_cancelled_write_fails_its_callers(hass):
+    device = FakeDevice()
+    device.release = asyncio.Event()
+    queue = WriteQueue(hass, device.async_write, 0)
+    pending = asyncio.create_task(queue.async_set_values({"om": "1"}))
+    await asyncio.sleep(0.01)
+    assert device.writes == [{"om": "1"}]
+
+    for task in asyncio.all_tasks():
+        if task.get_coro().__qualname__ == "WriteQueue._async_write":
+            task.cancel()
+    with pytest.raises(HomeAssistantError):
+        await pending